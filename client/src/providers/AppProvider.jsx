@@ -1,4 +1,4 @@
-import { createContext, useState, useEffect, useMemo } from "react";
+import { createContext, useState, useEffect, useMemo, useRef } from "react";
 
 export const AppContext = createContext();
 
@@ -17,6 +17,53 @@ export const AppProvider = ({ children }) => {
         checkSession();
     }, []);
 
+    // --- Live updates (GET /events) ---
+    // Changes made in another browser or device arrive as server-sent events.
+    // Our own changes come back too, so every handler is an idempotent upsert.
+    const categoriesRef = useRef(userCategories);
+    useEffect(() => {
+        categoriesRef.current = userCategories;
+    }, [userCategories]);
+
+    useEffect(() => {
+        if (!userInfo) return;
+        const source = new EventSource(`${API_URL}/events`, { withCredentials: true });
+
+        const removeProduct = (categories, productId) => categories
+            .map(cat => ({ ...cat, products: cat.products.filter(p => p.id !== productId) }))
+            .filter(cat => cat.products.length > 0);
+
+        const onProduct = (e) => {
+            const product = JSON.parse(e.data);
+            if (!categoriesRef.current.some(cat => cat.id === product.category_id)) {
+                // First product in a category we don't hold yet: re-pull the tree
+                checkSession();
+                return;
+            }
+            setUserCategories(prev => {
+                const rest = prev.map(cat => ({ ...cat, products: cat.products.filter(p => p.id !== product.id) }));
+                return rest
+                    .map(cat => cat.id === product.category_id ? { ...cat, products: [...cat.products, product] } : cat)
+                    .filter(cat => cat.products.length > 0);
+            });
+        };
+
+        source.addEventListener('product.created', onProduct);
+        source.addEventListener('product.updated', onProduct);
+        source.addEventListener('product.deleted', (e) => {
+            const { id } = JSON.parse(e.data);
+            setUserCategories(prev => removeProduct(prev, id));
+        });
+        source.addEventListener('category.created', (e) => {
+            const category = JSON.parse(e.data);
+            setAllCategories(prev => prev.some(c => c.id === category.id) ? prev : [...prev, category]);
+        });
+        // Bulk changes, missed events or a lagging stream: reload everything
+        source.addEventListener('reset', () => checkSession());
+
+        return () => source.close();
+    }, [userInfo?.id]);
+
 
     const checkSession = async () => {
         setLoading(true);
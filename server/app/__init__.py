@@ -1,19 +1,40 @@
 # app/__init__.py
+import os
 from flask import Flask
 from flask_cors import CORS
-from .extensions import db, bcrypt, ma  
+from .extensions import db, init_migrate
 from .routes import bp
+from .cli import register_commands
+from .database import prepare_engine_config, configure_engines
+from .cache import init_cache
+from .sessions import init_sessions
+from .metrics import init_metrics
+from .batching import init_batching
+from .events import init_events
+from .compression import init_compression
 
-def create_app():
+def create_app(test_config=None):
     app = Flask(__name__)
     app.config.from_pyfile('config.py')
+    app.config.from_prefixed_env()
+    if test_config:
+        app.config.update(test_config)
     
     CORS(app, supports_credentials=True, origins=["http://localhost:5173"])
     
+    prepare_engine_config(app)
     db.init_app(app)
-    bcrypt.init_app(app)
-    ma.init_app(app)
+    configure_engines(app, db)
+    if os.environ.get('FLASK_RUN_FROM_CLI'):
+        init_migrate(app)
+    init_cache(app)
+    init_sessions(app)
+    init_metrics(app)
+    init_batching(app)
+    init_events(app)
+    init_compression(app)
     
     app.register_blueprint(bp, strict_slashes=False)
+    register_commands(app)
     
     return app
\ No newline at end of file
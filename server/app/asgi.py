@@ -0,0 +1,282 @@
+# app/asgi.py
+import io
+import sys
+from urllib.parse import unquote
+from flask import current_app, jsonify, request, session
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from .database import install_hooks, is_file_sqlite
+from .cache import drop_cached_catalog, get_cached_catalog, set_cached_catalog
+from .columnar import COLUMNAR_MIMETYPE, build_columnar, columnar_statement, wants_columnar
+from .hashing import HashingBusy, hasher, hash_rounds
+from .metrics import install_sql_hooks, serialization_timer
+from .models import User, Category, InventoryVersion
+from .routes import busy_response, products_page, products_page_statement
+from .serializers import categories_serializer, group_user_categories, user_categories_statement
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+except ImportError:
+    raise RuntimeError("ASGI mode needs aiosqlite and asgiref (pip install aiosqlite asgiref uvicorn)")
+
+# -------------------------------------------------
+# ASGI serving mode
+# -------------------------------------------------
+# The hot paths - login (bcrypt) and the read routes that dump large trees -
+# run as coroutines over an AsyncSession (sqlite+aiosqlite), so a slow hash
+# or query parks a coroutine instead of a worker thread. Each native handler
+# runs inside a real Flask request context, which keeps session handling
+# (cookie or server-side), before/after_request hooks, CORS and the
+# Server-Timing metrics identical to the WSGI app. Every other route of the
+# main blueprint is passed through to the same Flask app in a thread pool.
+#
+# Served by server/asgi.py (see ASGI_* in config.py).
+
+
+class AsgiApp:
+    def __init__(self, flask_app):
+        uri = flask_app.config['SQLALCHEMY_DATABASE_URI']
+        if not is_file_sqlite(uri):
+            raise RuntimeError("ASGI mode needs a file-backed SQLite database")
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+
+        profile = flask_app.config['SQLITE_PROFILES'][flask_app.config['SQLITE_PROFILE']]
+        self.engine = create_async_engine(
+            make_url(uri).set(drivername='sqlite+aiosqlite'),
+            pool_size=flask_app.config['ASGI_DB_POOL_SIZE'],
+            max_overflow=0,
+        )
+        install_hooks(self.engine.sync_engine, dict(profile.get('pragmas', {})), immediate=False)
+        if flask_app.config['METRICS_ENABLED']:
+            install_sql_hooks(self.engine.sync_engine)
+        self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+
+        self.routes = {
+            ('POST', '/login'): login,
+            ('GET', '/profile'): profile_view,
+            ('GET', '/check_session'): check_session,
+            ('GET', '/categories'): get_categories,
+            ('GET', '/products'): list_products,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] == 'http':
+            handler = self.routes.get((scope['method'], scope['path'].rstrip('/') or '/'))
+            if handler is not None:
+                return await self.handle(handler, scope, receive, send)
+        return await self.wsgi(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                hasher.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def handle(self, handler, scope, receive, send):
+        body = await read_body(receive)
+        app = self.flask_app
+        # Each ASGI request runs in its own task, so the context stays private to it
+        ctx = app.request_context(build_environ(scope, body))
+        ctx.push()
+        error = None
+        try:
+            try:
+                rv = app.preprocess_request()
+                if rv is None:
+                    async with self.sessionmaker() as db_session:
+                        rv = await handler(db_session)
+            except Exception as e:
+                rv = app.handle_user_exception(e)
+            response = app.finalize_request(rv)
+        except Exception as e:
+            error = e
+            response = app.handle_exception(e)
+        finally:
+            ctx.pop(error)
+
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': [(k.lower().encode('latin1'), v.encode('latin1')) for k, v in response.headers.items()],
+        })
+        await send({'type': 'http.response.body', 'body': response.get_data()})
+
+
+async def read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+def build_environ(scope, body):
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf8').decode('latin1'),
+        'PATH_INFO': unquote(scope['path']).encode('utf8').decode('latin1'),
+        'QUERY_STRING': scope['query_string'].decode('ascii'),
+        'SERVER_NAME': scope['server'][0] if scope.get('server') else 'localhost',
+        'SERVER_PORT': str(scope['server'][1]) if scope.get('server') else '80',
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'REMOTE_ADDR': scope['client'][0] if scope.get('client') else '',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope['headers']:
+        name = name.decode('latin1')
+        if name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        elif name == 'content-type':
+            key = 'CONTENT_TYPE'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        value = value.decode('latin1')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+# -------------------------------------------------
+# Async handlers (same responses as app/routes.py)
+# -------------------------------------------------
+async def current_version(db_session, key):
+    version = await db_session.scalar(select(InventoryVersion.version).where(InventoryVersion.key == key))
+    return version or 0
+
+
+async def user_etag(db_session, user_id):
+    key = InventoryVersion.user_key(user_id)
+    return f'{key}-v{await current_version(db_session, key)}'
+
+
+async def dump_user(db_session, user):
+    with serialization_timer():
+        rows = await db_session.execute(user_categories_statement(user.id))
+        return {"id": user.id, "name": user.name, "categories": group_user_categories(rows, user.id)}
+
+
+async def dump_user_columnar(db_session, user):
+    with serialization_timer():
+        return build_columnar(user.id, user.name, await db_session.execute(columnar_statement(user.id)))
+
+
+async def with_sync_version(db_session, dump, user):
+    # Read before the tree, as in app/routes.py
+    sync_version = await current_version(db_session, InventoryVersion.SYNC)
+    return {**await dump(db_session, user), "sync_version": sync_version}
+
+
+async def user_snapshot(db_session, user_id, wrap=lambda user: user):
+    etag = await user_etag(db_session, user_id)
+    if wants_columnar():
+        async def build():
+            return wrap(await with_sync_version(db_session, dump_user_columnar, await db_session.get(User, user_id)))
+        response = await conditional_response(f'{etag}-columnar', build)
+        if response.status_code == 200:
+            response.mimetype = COLUMNAR_MIMETYPE
+    else:
+        async def build():
+            return wrap(await with_sync_version(db_session, dump_user, await db_session.get(User, user_id)))
+        response = await conditional_response(etag, build)
+    response.vary.add('Accept')
+    return response
+
+
+async def conditional_response(etag, build):
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        body = await build()
+        if isinstance(body, bytes):
+            response = current_app.response_class(body, mimetype='application/json')
+        else:
+            response = jsonify(body)
+    response.set_etag(etag)
+    return response
+
+
+async def login(db_session):
+    data = request.get_json()
+    if not data or 'name' not in data or 'password' not in data:
+        return jsonify({"error": "name & password required"}), 400
+    user = await db_session.scalar(select(User).where(User.name == data['name']).limit(1))
+    try:
+        authenticated = user and await hasher.check_password_async(user._password_hash, data['password'])
+        if authenticated and hash_rounds(user._password_hash) != current_app.config['BCRYPT_LOG_ROUNDS']:
+            # Transparently upgrade the stored hash to the configured cost
+            user._password_hash = await hasher.hash_password_async(data['password'])
+            await db_session.commit()
+    except HashingBusy:
+        return busy_response()
+    if authenticated:
+        session['user_id'] = user.id
+        session['name'] = user.name
+        return await with_sync_version(db_session, dump_user, user), 200
+    return jsonify({"error": "Invalid credentials"}), 401
+
+
+async def profile_view(db_session):
+    if 'user_id' not in session:
+        return jsonify({"error": "Login required"}), 401
+    return await user_snapshot(db_session, session['user_id'])
+
+
+async def check_session(db_session):
+    if request.args.get('shallow', type=int):
+        if 'user_id' in session:
+            user = {"id": session['user_id'], "name": session.get('name')}
+            if request.args.get('version', type=int):
+                user["version"] = await current_version(db_session, InventoryVersion.user_key(session['user_id']))
+            return jsonify({"logged_in": True, "user": user})
+        return jsonify({"logged_in": False})
+
+    if 'user_id' in session:
+        return await user_snapshot(db_session, session['user_id'], lambda user: {"logged_in": True, "user": user})
+    return jsonify({"logged_in": False})
+
+
+async def get_categories(db_session):
+    cached = get_cached_catalog()
+    if cached is None:
+        version = await current_version(db_session, InventoryVersion.CATEGORIES)
+        etag = f'{InventoryVersion.CATEGORIES}-v{version}'
+        categories = (await db_session.scalars(select(Category))).all()
+        body = current_app.json.response(categories_serializer.dump(categories)).get_data()
+        set_cached_catalog(etag, body)
+        # Re-check outside the read transaction (see app/cache.py)
+        await db_session.rollback()
+        if await current_version(db_session, InventoryVersion.CATEGORIES) != version:
+            drop_cached_catalog()
+    else:
+        etag, body = cached
+
+    async def build():
+        return body
+
+    return await conditional_response(etag, build)
+
+
+async def list_products(db_session):
+    if 'user_id' not in session:
+        return jsonify({"error": "Login required"}), 401
+    try:
+        stmt, sort, limit = products_page_statement(session['user_id'], request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    products = (await db_session.scalars(stmt)).all()
+    return jsonify(products_page(products, sort, limit))
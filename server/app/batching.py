@@ -0,0 +1,187 @@
+# app/batching.py
+import atexit
+import threading
+import time
+from concurrent.futures import Future
+from .database import is_file_sqlite
+from .events import RESET, get_broker, queue_event
+from .extensions import db
+from .models import Product, InventoryVersion, SyncEntry
+
+# -------------------------------------------------
+# Group commit for product edits (opt-in: WRITE_BATCHING)
+# -------------------------------------------------
+# Floor scanners send bursts of small PATCH /products/<id>/edit calls, and on
+# SQLite every commit is an fsync. With batching on, the route validates the
+# edit and hands the changed fields to this queue instead of committing:
+# edits to the same product are merged, and a background writer applies
+# everything that arrived within WRITE_BATCH_WINDOW seconds in one
+# transaction (one version bump and one sync record per user).
+#
+# The queue is bounded by WRITE_BATCH_MAX_PENDING distinct products; past
+# that submit() raises WriteQueueFull and the route answers 503 with
+# Retry-After. Callers that need the edit on disk before the response pass
+# ?durable=1 and wait for their batch to commit. Anything still queued at
+# interpreter exit is flushed.
+#
+# A queued name stays claimed until its batch is written, so a second product
+# can't be renamed to it in the meantime (submit() raises NameTaken). An edit
+# that still fails in the writer is reported to its owner as a `reset` event
+# ({"reason": "edit_failed", "id": ...}) so clients drop the optimistic state.
+
+
+class WriteQueueFull(Exception):
+    """Raised when the edit queue is at WRITE_BATCH_MAX_PENDING"""
+
+
+class NameTaken(Exception):
+    """Raised when another product has an unwritten edit to the same name"""
+
+
+class EditBatcher:
+    def __init__(self, app):
+        self.app = app
+        self.window = app.config['WRITE_BATCH_WINDOW']
+        self.max_pending = app.config['WRITE_BATCH_MAX_PENDING']
+        self._pending = {}      # product id -> [user_id, changes, futures, claimed names]
+        self._names = {}        # queued or in-flight name -> product id
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        self.batches = 0
+        self.edits = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.failed = 0
+
+    def submit(self, product_id, user_id, changes):
+        """Queue an edit; returns (merged changes, Future resolved once committed)"""
+        future = Future()
+        name = changes.get('name')
+        with self._cond:
+            if self._names.get(name, product_id) != product_id:
+                raise NameTaken(name)
+            entry = self._pending.get(product_id)
+            if entry is None:
+                if len(self._pending) >= self.max_pending:
+                    self.rejected += 1
+                    raise WriteQueueFull('edit queue is full')
+                entry = self._pending[product_id] = [user_id, {}, [], set()]
+            else:
+                self.coalesced += 1
+            if name is not None:
+                self._names[name] = product_id
+                entry[3].add(name)
+            entry[1].update(changes)
+            entry[2].append(future)
+            self.edits += 1
+            merged = dict(entry[1])
+            self._start()
+            self._cond.notify()
+        return merged, future
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='edit-batcher', daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+            # Let the burst accumulate before taking the batch
+            if not self._stopped:
+                time.sleep(self.window)
+            with self._cond:
+                batch, self._pending = self._pending, {}
+            self._write(batch)
+
+    def _write(self, batch):
+        with self.app.app_context():
+            try:
+                self._apply(batch)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                # One bad edit must not sink the rest: retry them one by one
+                for product_id, entry in batch.items():
+                    try:
+                        self._apply({product_id: entry})
+                        db.session.commit()
+                    except Exception as e:
+                        db.session.rollback()
+                        self._resolve(entry, error=e)
+                        entry[2] = []
+                        get_broker().publish(entry[0], RESET, {"reason": "edit_failed", "id": product_id})
+            finally:
+                db.session.remove()
+        for entry in batch.values():
+            self._resolve(entry)
+        with self._cond:
+            self.batches += 1
+            for product_id, entry in batch.items():
+                # Keep names that a newer queued edit of the product claimed again
+                requeued = self._pending.get(product_id)
+                for name in entry[3]:
+                    if self._names.get(name) == product_id and not (requeued and name in requeued[3]):
+                        del self._names[name]
+
+    def _apply(self, batch):
+        updated = {}
+        for product_id, (user_id, changes, _, _) in batch.items():
+            row = db.session.execute(
+                db.update(Product)
+                .where(Product.id == product_id, Product.user_id == user_id)
+                .values(**changes)
+                .returning(*Product.__table__.c)
+            ).first()
+            # A product deleted while its edit was queued is skipped
+            if row is not None:
+                updated.setdefault(user_id, []).append(product_id)
+                queue_event(db.session, user_id, 'product.updated', dict(row._mapping))
+        for user_id, product_ids in updated.items():
+            InventoryVersion.bump(InventoryVersion.user_key(user_id))
+            SyncEntry.record_many(SyncEntry.PRODUCT, product_ids, user_id)
+
+    def _resolve(self, entry, error=None):
+        for future in entry[2]:
+            if error is None:
+                future.set_result(True)
+            else:
+                with self._cond:
+                    self.failed += 1
+                future.set_exception(error)
+
+    def stop(self):
+        """Flush whatever is queued and stop the writer"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "batches": self.batches,
+                "edits": self.edits,
+                "coalesced": self.coalesced,
+                "rejected": self.rejected,
+                "failed": self.failed
+            }
+
+
+def init_batching(app):
+    if not app.config['WRITE_BATCHING']:
+        return
+    if not is_file_sqlite(app.config['SQLALCHEMY_DATABASE_URI']):
+        # An in-memory database shares one connection across threads, so the
+        # writer would commit in the middle of request transactions
+        raise RuntimeError("WRITE_BATCHING needs a file-backed SQLite database")
+    app.extensions['edit_batcher'] = EditBatcher(app)
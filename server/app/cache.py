@@ -0,0 +1,132 @@
+# app/cache.py
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from .database import RoutingSession
+from .models import Category, InventoryVersion
+
+# -------------------------------------------------
+# Category catalog cache
+# -------------------------------------------------
+# GET /categories is read on every product form mount but the catalog rarely
+# changes, so the serialized response body (and its ETag) is cached and hits
+# never reach the ORM. Any flush that inserts, updates or deletes a Category
+# - create_category, imports, cascades - bumps the catalog version (and with
+# it the ETag), and the entry is dropped once that transaction commits.
+#
+# A miss stores the body it built and then re-reads the version in a fresh
+# transaction, dropping the entry if a category commit slipped in meanwhile.
+# Storing before the re-check means a commit the re-check doesn't see has its
+# own invalidation land after the store, so a stale body can't stick.
+#
+# Backends: "memory" (per process, TTL + LRU) and "redis" (any
+# Redis-compatible server at CACHE_REDIS_URL, shared by every worker; needs
+# the optional `redis` package).
+
+CATEGORIES_KEY = 'finventory:categories'
+
+
+class MemoryCache:
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class RedisCache:
+    def __init__(self, url, ttl):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND = 'redis' needs the redis package (pip install redis)")
+        self.ttl = ttl
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        return self._client.get(key)
+
+    def set(self, key, value):
+        self._client.set(key, value, ex=self.ttl)
+
+    def delete(self, key):
+        self._client.delete(key)
+
+
+def init_cache(app):
+    backend = app.config['CACHE_BACKEND']
+    if backend == 'memory':
+        cache = MemoryCache(app.config['CACHE_TTL'], app.config['CACHE_MAX_ENTRIES'])
+    elif backend == 'redis':
+        cache = RedisCache(app.config['CACHE_REDIS_URL'], app.config['CACHE_TTL'])
+    else:
+        raise ValueError(f"Unknown CACHE_BACKEND {backend!r}")
+    app.extensions['catalog_cache'] = cache
+
+
+def get_cache():
+    return current_app.extensions['catalog_cache']
+
+
+# Cached values are "<etag>\0<response body>" so both backends store bytes
+def get_cached_catalog():
+    value = get_cache().get(CATEGORIES_KEY)
+    if value is None:
+        return None
+    etag, _, body = value.partition(b'\0')
+    return etag.decode(), body
+
+
+def set_cached_catalog(etag, body):
+    get_cache().set(CATEGORIES_KEY, etag.encode() + b'\0' + body)
+
+
+def drop_cached_catalog():
+    get_cache().delete(CATEGORIES_KEY)
+
+
+# -------------------------------------------------
+# Invalidation
+# -------------------------------------------------
+@event.listens_for(RoutingSession, 'after_flush')
+def note_category_changes(session, flush_context):
+    changed = session.new | session.dirty | session.deleted
+    if any(isinstance(obj, Category) for obj in changed):
+        session.connection().execute(InventoryVersion.bump_statement(InventoryVersion.CATEGORIES))
+        session.info['categories_changed'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def invalidate_catalog(session):
+    if session.info.pop('categories_changed', False) and has_app_context():
+        drop_cached_catalog()
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def forget_category_changes(session):
+    session.info.pop('categories_changed', None)
@@ -0,0 +1,65 @@
+# app/cli.py
+import click
+from sqlalchemy import inspect
+from flask.cli import with_appcontext
+from .extensions import db
+from .models import User
+from .importer import FORMATS, import_products
+from .stats import rebuild_stats
+
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Create the schema on a fresh database, or migrate an existing one to head"""
+    from flask_migrate import stamp, upgrade
+    tables = set(inspect(db.engine).get_table_names()) - {'alembic_version'}
+    if tables:
+        # create_all() would skip the indexes, search table and backfills the
+        # migrations add to existing tables, so run them instead
+        upgrade()
+        click.echo("✓ Existing database migrated to the latest schema")
+    else:
+        db.create_all()
+        stamp()
+        click.echo("✓ Created a fresh database schema")
+
+
+@click.command('import-products')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--user', 'user_name', required=True, help='Owner of the imported products')
+@click.option('--format', 'fmt', type=click.Choice(FORMATS), help='Defaults to the file extension')
+@click.option('--chunk-size', default=5000, show_default=True, help='Rows per commit')
+@click.option('--skip', default=0, help='Resume after this line of the file')
+@with_appcontext
+def import_products_command(path, user_name, fmt, chunk_size, skip):
+    """Stream a CSV/NDJSON file of products into the database"""
+    user = User.query.filter_by(name=user_name).first()
+    if not user:
+        raise click.ClickException(f"No user named {user_name!r}")
+    fmt = fmt or ('csv' if path.endswith('.csv') else 'ndjson')
+
+    with open(path, 'rb') as stream:
+        result = import_products(stream, fmt, user.id, chunk_size=chunk_size, skip=skip)
+
+    click.echo(f"✓ Imported {result['inserted']} products ({result['rows_per_second']} rows/s)")
+    for error in result['errors']:
+        click.echo(f"  - line {error['line']}: {error['error']}")
+    if 'failed' in result:
+        raise click.ClickException(
+            f"{result['failed']}\nResume with --skip {result['committed']}"
+        )
+
+
+@click.command('rebuild-stats')
+@with_appcontext
+def rebuild_stats_command():
+    """Recompute the per-user, per-category and per-rack summary tables"""
+    rebuild_stats()
+    click.echo("✓ Rebuilt inventory statistics")
+
+
+def register_commands(app):
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(import_products_command)
+    app.cli.add_command(rebuild_stats_command)
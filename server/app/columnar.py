@@ -0,0 +1,71 @@
+# app/columnar.py
+from flask import request
+from .extensions import db
+from .models import Category, Product
+
+# -------------------------------------------------
+# Columnar inventory snapshot
+# -------------------------------------------------
+# The nested user tree repeats every product key once per product. Clients
+# that send `Accept: application/vnd.finventory.columnar+json` get the same
+# data as column arrays instead: one array per product field, with category,
+# rack and bin stored as indexes into small dictionaries (null for a missing
+# rack/bin). user_id is the snapshot's own id, so it is not repeated.
+#
+#     {"format": "columnar", "version": 1, "id": 1, "name": "ann",
+#      "categories": {"id": [3, 7], "name": ["Tools", "Parts"]},
+#      "racks": ["A1"], "bins": ["B2", "B3"],
+#      "products": {"id": [..], "name": [..], "category": [0, 1],
+#                   "rack": [0, 0], "bin": [0, null]}}
+#
+# Products come in (category_id, id) order, like the nested tree.
+
+COLUMNAR_MIMETYPE = 'application/vnd.finventory.columnar+json'
+
+
+def wants_columnar():
+    best = request.accept_mimetypes.best_match(['application/json', COLUMNAR_MIMETYPE])
+    return best == COLUMNAR_MIMETYPE
+
+
+def columnar_statement(user_id):
+    # Inner join, like the nested tree: products without a category row are left out
+    return (
+        db.select(Product.id, Product.name, Product.category_id, Category.name, Product.rack, Product.bin)
+        .join(Category, Product.category_id == Category.id)
+        .where(Product.user_id == user_id)
+        .order_by(Product.category_id, Product.id)
+    )
+
+
+def build_columnar(user_id, name, rows):
+    """Snapshot from columnar_statement() rows"""
+    ids, names, categories, racks, bins = [], [], [], [], []
+    category_index, category_names, rack_index, bin_index = {}, [], {}, {}
+    for prod_id, prod_name, category_id, category_name, rack, bin_ in rows:
+        ids.append(prod_id)
+        names.append(prod_name)
+        if category_id not in category_index:
+            category_index[category_id] = len(category_index)
+            category_names.append(category_name)
+        categories.append(category_index[category_id])
+        racks.append(None if rack is None else rack_index.setdefault(rack, len(rack_index)))
+        bins.append(None if bin_ is None else bin_index.setdefault(bin_, len(bin_index)))
+
+    return {
+        "format": "columnar",
+        "version": 1,
+        "id": user_id,
+        "name": name,
+        "categories": {
+            "id": list(category_index),
+            "name": category_names
+        },
+        "racks": list(rack_index),
+        "bins": list(bin_index),
+        "products": {"id": ids, "name": names, "category": categories, "rack": racks, "bin": bins}
+    }
+
+
+def dump_user_columnar(user):
+    return build_columnar(user.id, user.name, db.session.execute(columnar_statement(user.id)))
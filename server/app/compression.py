@@ -0,0 +1,59 @@
+# app/compression.py
+import gzip
+from flask import request
+
+# -------------------------------------------------
+# Response compression
+# -------------------------------------------------
+# JSON, columnar and CSV bodies of at least COMPRESS_MIN_SIZE bytes are
+# compressed with brotli (when the optional `brotli` package is installed and
+# the client accepts it) or gzip. Small bodies, streamed responses (exports,
+# /events) and anything already encoded are sent as is. Compressed responses
+# carry a weak ETag, which If-None-Match still matches (weak comparison).
+
+COMPRESSIBLE = ('application/json', 'application/vnd.finventory.columnar+json', 'text/csv', 'text/plain')
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def compress_response(response, config):
+    if (response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE):
+        return response
+    response.vary.add('Accept-Encoding')
+
+    body = response.get_data()
+    if len(body) < config['COMPRESS_MIN_SIZE']:
+        return response
+
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        body = brotli.compress(body, quality=config['COMPRESS_BROTLI_QUALITY'])
+        encoding = 'br'
+    elif accepted['gzip']:
+        body = gzip.compress(body, compresslevel=config['COMPRESS_GZIP_LEVEL'])
+        encoding = 'gzip'
+    else:
+        return response
+
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    if not app.config['COMPRESS_ENABLED']:
+        return
+
+    @app.after_request
+    def compress(response):
+        return compress_response(response, app.config)
@@ -1,3 +1,93 @@
 SECRET_KEY = 'change-me-to-a-random-string'
 SQLALCHEMY_DATABASE_URI = 'sqlite:///app.db'
-SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+# Dump responses through the compiled serializers in app/serializers.py
+FAST_SERIALIZERS = False
+
+# GET /products page size (default and cap)
+PRODUCTS_PAGE_SIZE = 50
+PRODUCTS_PAGE_MAX = 200
+
+# GET /sync change entries per page (default and cap)
+SYNC_PAGE_SIZE = 1000
+SYNC_PAGE_MAX = 5000
+
+# Largest batch accepted by POST /products/bulk (upserts + deletes)
+BULK_MAX_ITEMS = 50000
+
+# Rows fetched per round trip by GET /products/export
+EXPORT_BATCH_SIZE = 1000
+
+# Password hashing (app/hashing.py): bcrypt cost, worker processes
+# (0 = hash inline), max hashes in flight before 503s, seconds to wait
+BCRYPT_LOG_ROUNDS = 12
+HASH_WORKERS = 2
+HASH_MAX_PENDING = 16
+HASH_TIMEOUT = 10
+
+# SQLite engine profile (app/database.py), e.g. FLASK_SQLITE_PROFILE=production
+SQLITE_PROFILE = 'development'
+SQLITE_PROFILES = {
+    'development': {
+        'pragmas': {'busy_timeout': 5000},
+    },
+    'production': {
+        'pragmas': {
+            'busy_timeout': 5000,
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'cache_size': -65536,      # KiB, i.e. 64 MiB per connection
+            'mmap_size': 268435456,    # 256 MiB
+            'temp_store': 'MEMORY',
+        },
+        'pool_size': 2,
+        'max_overflow': 2,
+        'pool_timeout': 30,
+        'immediate_writes': False,     # BEGIN IMMEDIATE on the writer pool (holds the
+                                       # lock for whole POSTs, including /login's dump)
+        'readers': 8,                  # read-only pool for GET requests
+    },
+}
+
+# Category catalog cache (app/cache.py): 'memory' or 'redis'
+CACHE_BACKEND = 'memory'
+CACHE_TTL = 300
+CACHE_MAX_ENTRIES = 128
+CACHE_REDIS_URL = 'redis://localhost:6379/0'
+
+# Session storage (app/sessions.py): 'cookie' (Flask signed cookie),
+# 'memory' or 'sqlite' (server-side, cookie holds only a session id)
+SESSION_BACKEND = 'cookie'
+
+# Per-request SQL/timing instrumentation (app/metrics.py): Server-Timing
+# headers, slow-request log and GET /metrics (Prometheus text format)
+METRICS_ENABLED = False
+SLOW_REQUEST_MS = 500
+
+# ASGI serving mode (server/asgi.py, app/asgi.py)
+ASGI_HOST = '127.0.0.1'
+ASGI_PORT = 5555
+ASGI_WORKERS = 4               # worker processes; each has its own pools and hash workers
+ASGI_KEEP_ALIVE = 5            # seconds an idle keep-alive connection stays open
+ASGI_DB_POOL_SIZE = 8          # aiosqlite connections per worker
+
+# Group commit for PATCH /products/<id>/edit (app/batching.py)
+WRITE_BATCHING = False
+WRITE_BATCH_WINDOW = 0.05      # seconds edits are gathered before one commit
+WRITE_BATCH_MAX_PENDING = 1000 # distinct queued products before answering 503
+WRITE_BATCH_TIMEOUT = 5        # seconds a ?durable=1 edit waits for its commit
+
+# GET /events change stream (app/events.py): 'memory' or 'redis' broker
+EVENTS_BROKER = 'memory'
+EVENTS_REDIS_URL = 'redis://localhost:6379/0'
+EVENTS_HEARTBEAT = 15          # seconds between keep-alive comments
+EVENTS_BUFFER = 256            # events a subscriber may fall behind before a reset
+EVENTS_HISTORY = 1000          # recent events kept for Last-Event-ID replay
+
+# Response compression (app/compression.py); brotli needs the optional
+# `brotli` package, gzip is always available
+COMPRESS_ENABLED = True
+COMPRESS_MIN_SIZE = 1024       # bytes; smaller bodies are sent as is
+COMPRESS_GZIP_LEVEL = 6
+COMPRESS_BROTLI_QUALITY = 5
@@ -0,0 +1,87 @@
+# app/database.py
+from flask import has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# -------------------------------------------------
+# SQLite engine profiles
+# -------------------------------------------------
+# A profile (SQLITE_PROFILES[SQLITE_PROFILE] in config.py) describes how the
+# engine is tuned: PRAGMAs run on every new pooled connection, pool sizing,
+# whether writes take the lock up front with BEGIN IMMEDIATE, and an optional
+# separate read-only pool that GET requests are routed to. Pick one per
+# environment with FLASK_SQLITE_PROFILE=<name>.
+
+READER_BIND = 'reader'
+
+
+def is_file_sqlite(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+
+
+def prepare_engine_config(app):
+    """Fill in engine options and the reader bind before db.init_app()"""
+    profile = app.config['SQLITE_PROFILES'][app.config['SQLITE_PROFILE']]
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    if not is_file_sqlite(uri):
+        return
+
+    options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+    for key in ('pool_size', 'max_overflow', 'pool_timeout'):
+        if key in profile:
+            options.setdefault(key, profile[key])
+
+    if profile.get('readers'):
+        binds = app.config.setdefault('SQLALCHEMY_BINDS', {})
+        binds.setdefault(READER_BIND, {
+            'url': uri,
+            'pool_size': profile['readers'],
+            'max_overflow': 0,
+        })
+
+
+def configure_engines(app, db):
+    """Attach the profile's connection hooks to the engines db.init_app() built"""
+    profile = app.config['SQLITE_PROFILES'][app.config['SQLITE_PROFILE']]
+    with app.app_context():
+        engines = db.engines
+    for key, engine in engines.items():
+        if engine.dialect.name != 'sqlite':
+            continue
+        pragmas = dict(profile.get('pragmas', {}))
+        if key == READER_BIND:
+            pragmas['query_only'] = 'ON'
+        immediate = profile.get('immediate_writes') and key != READER_BIND
+        install_hooks(engine, pragmas, immediate)
+
+
+def install_hooks(engine, pragmas, immediate):
+    @event.listens_for(engine, 'connect')
+    def on_connect(dbapi_connection, connection_record):
+        if immediate:
+            # Let SQLAlchemy emit BEGIN itself (see on_begin)
+            dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+    if immediate:
+        @event.listens_for(engine, 'begin')
+        def on_begin(conn):
+            # Take the write lock at BEGIN so busy_timeout applies, instead of
+            # failing with "database is locked" when a read upgrades to a write
+            conn.exec_driver_sql('BEGIN IMMEDIATE')
+
+
+class RoutingSession(Session):
+    """Sends GET/HEAD requests to the read-only pool when the profile has one"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context() and request.method in ('GET', 'HEAD'):
+            reader = self._db.engines.get(READER_BIND)
+            if reader is not None:
+                return reader
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
@@ -0,0 +1,229 @@
+# app/events.py
+import json
+import threading
+from collections import deque
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from .database import RoutingSession
+from .models import Category, Product
+from .serializers import dump_category, dump_product
+
+# -------------------------------------------------
+# Inventory change events (GET /events)
+# -------------------------------------------------
+# Flushes that create, update or delete a Product or Category queue an event
+# on the session; the events are published once that transaction commits
+# (and dropped on rollback), so subscribers never see uncommitted changes.
+# Core-statement writers (bulk, import, the edit batcher) queue theirs with
+# queue_event(). Category events go to every user, product events to the
+# owner only. A "reset" event means "re-pull /check_session": it is sent
+# after bulk changes, when a resume point is too old to replay, and when a
+# subscriber falls EVENTS_BUFFER events behind (the stream is then closed
+# and the client reconnects).
+#
+# Brokers: "memory" (per process; keeps the last EVENTS_HISTORY events for
+# Last-Event-ID replay) and "redis" (one Redis stream shared by every
+# worker; needs the optional `redis` package).
+
+RESET = 'reset'
+
+
+class Subscription:
+    def __init__(self, user_id, size):
+        self.user_id = user_id
+        self.size = size
+        self.closed = False
+        self._overflowed = False
+        self._buffer = deque()
+        self._cond = threading.Condition()
+
+    def put(self, item):
+        with self._cond:
+            if self._overflowed:
+                return
+            if len(self._buffer) >= self.size:
+                # Too far behind: drop the backlog instead of growing it
+                self._buffer.clear()
+                self._buffer.append((None, RESET, '{"reason": "overflow"}'))
+                self._overflowed = True
+            else:
+                self._buffer.append(item)
+            self._cond.notify()
+
+    def get(self, timeout):
+        """Buffered (id, type, data) events, or [] after ``timeout`` seconds"""
+        with self._cond:
+            if not self._buffer:
+                self._cond.wait(timeout)
+            items = list(self._buffer)
+            self._buffer.clear()
+            # Close only once the overflow reset has been handed out
+            self.closed = self._overflowed
+            return items
+
+
+class MemoryBroker:
+    def __init__(self, history, buffer_size):
+        self.buffer_size = buffer_size
+        self._history = deque(maxlen=history)
+        self._subscribers = set()
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def publish(self, user_id, event_type, data):
+        with self._lock:
+            item = (self._next_id, user_id, event_type, json.dumps(data))
+            self._next_id += 1
+            self._history.append(item)
+            # Fan out under the lock so a concurrent subscribe() can't get
+            # the same event both from history and live
+            for subscription in self._subscribers:
+                if user_id is None or subscription.user_id == user_id:
+                    subscription.put((str(item[0]), event_type, item[3]))
+
+    def subscribe(self, user_id, last_id=None):
+        subscription = Subscription(user_id, self.buffer_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if last_id is None:
+                return subscription
+            oldest = self._history[0][0] if self._history else self._next_id
+            try:
+                last = int(last_id)
+            except ValueError:
+                last = None
+            if last is None or not oldest - 1 <= last < self._next_id:
+                # Unknown, too old, or from before a restart
+                subscription.put((None, RESET, '{"reason": "resume"}'))
+                return subscription
+            for event_id, owner, event_type, data in self._history:
+                if event_id > last and (owner is None or owner == user_id):
+                    subscription.put((str(event_id), event_type, data))
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+
+class RedisSubscription:
+    def __init__(self, client, stream, user_id, last_id, size):
+        self.client = client
+        self.stream = stream
+        self.user_id = str(user_id)
+        self.size = size
+        self.closed = False
+        self._reset = False
+        latest = client.xrevrange(stream, count=1)
+        if last_id is None:
+            self.last_id = latest[0][0] if latest else '0-0'
+            return
+        oldest = client.xrange(stream, count=1)
+        if not oldest or stream_id(last_id) is None or stream_id(last_id) < stream_id(oldest[0][0]):
+            self.last_id = latest[0][0] if latest else '0-0'
+            self._reset = True
+        else:
+            self.last_id = last_id
+
+    def get(self, timeout):
+        if self._reset:
+            self._reset = False
+            return [(None, RESET, '{"reason": "resume"}')]
+        # Pull-based: a slow client never buffers more than one read on the server
+        response = self.client.xread({self.stream: self.last_id}, count=self.size, block=int(timeout * 1000))
+        items = []
+        for _, entries in response:
+            for event_id, fields in entries:
+                self.last_id = event_id
+                if fields['user_id'] in ('', self.user_id):
+                    items.append((event_id, fields['type'], fields['data']))
+        return items
+
+
+def stream_id(value):
+    try:
+        ms, _, seq = value.partition('-')
+        return int(ms), int(seq or 0)
+    except ValueError:
+        return None
+
+
+class RedisBroker:
+    STREAM = 'finventory:events'
+
+    def __init__(self, url, history, buffer_size):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("EVENTS_BROKER = 'redis' needs the redis package (pip install redis)")
+        self.history = history
+        self.buffer_size = buffer_size
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+
+    def publish(self, user_id, event_type, data):
+        fields = {'user_id': '' if user_id is None else str(user_id), 'type': event_type, 'data': json.dumps(data)}
+        self._client.xadd(self.STREAM, fields, maxlen=self.history, approximate=True)
+
+    def subscribe(self, user_id, last_id=None):
+        return RedisSubscription(self._client, self.STREAM, user_id, last_id, self.buffer_size)
+
+    def unsubscribe(self, subscription):
+        pass
+
+
+def init_events(app):
+    backend = app.config['EVENTS_BROKER']
+    if backend == 'memory':
+        broker = MemoryBroker(app.config['EVENTS_HISTORY'], app.config['EVENTS_BUFFER'])
+    elif backend == 'redis':
+        broker = RedisBroker(app.config['EVENTS_REDIS_URL'], app.config['EVENTS_HISTORY'], app.config['EVENTS_BUFFER'])
+    else:
+        raise ValueError(f"Unknown EVENTS_BROKER {backend!r}")
+    app.extensions['event_broker'] = broker
+
+
+def get_broker():
+    return current_app.extensions['event_broker']
+
+
+def format_event(event_id, event_type, data):
+    lines = [] if event_id is None else [f'id: {event_id}']
+    lines.append(f'event: {event_type}')
+    lines.append(f'data: {data}')
+    return '\n'.join(lines) + '\n\n'
+
+
+# -------------------------------------------------
+# Publishing
+# -------------------------------------------------
+def queue_event(session, user_id, event_type, data):
+    """Publish an event when ``session`` commits (user_id None: everyone)"""
+    session.info.setdefault('events', []).append((user_id, event_type, data))
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def collect_events(session, flush_context):
+    for action, objects in (('created', session.new), ('updated', session.dirty), ('deleted', session.deleted)):
+        for obj in objects:
+            if action == 'updated' and not session.is_modified(obj):
+                continue
+            if isinstance(obj, Product):
+                data = {"id": obj.id} if action == 'deleted' else dump_product(obj)
+                queue_event(session, obj.user_id, f'product.{action}', data)
+            elif isinstance(obj, Category):
+                data = {"id": obj.id} if action == 'deleted' else dump_category(obj)
+                queue_event(session, None, f'category.{action}', data)
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def publish_events(session):
+    events = session.info.pop('events', None)
+    if events and has_app_context() and 'event_broker' in current_app.extensions:
+        broker = get_broker()
+        for user_id, event_type, data in events:
+            broker.publish(user_id, event_type, data)
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def forget_events(session):
+    session.info.pop('events', None)
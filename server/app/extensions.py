@@ -1,9 +1,13 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_bcrypt import Bcrypt
-from flask_marshmallow import Marshmallow
+from .database import RoutingSession
 
 # Initialize extensions globally
 # They will be bound to the application later in create_app using init_app()
-db = SQLAlchemy()
-bcrypt = Bcrypt()
-ma = Marshmallow()
\ No newline at end of file
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+
+def init_migrate(app):
+    # Flask-Migrate pulls in Alembic (~100 ms of imports) and only the
+    # `flask db ...` commands need it, so it is set up for CLI runs only
+    from flask_migrate import Migrate
+    Migrate(app, db)
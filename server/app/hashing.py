@@ -0,0 +1,152 @@
+# app/hashing.py
+import asyncio
+import threading
+from concurrent.futures import TimeoutError
+import bcrypt
+from flask import current_app
+
+# -------------------------------------------------
+# Password hashing pool
+# -------------------------------------------------
+# bcrypt is deliberately slow (~250 ms at cost 12), so hashing runs in a small
+# process pool instead of on the request thread, where it would hold a worker
+# and compete for the GIL. Admission control caps the number of hashes in
+# flight: past HASH_MAX_PENDING new requests are turned away with HashingBusy
+# (the routes answer 503) instead of queueing behind a login burst.
+# HASH_WORKERS = 0 hashes inline, which is what scripts and tests want.
+#
+# Workers are started by a forkserver (spawn where there is none) rather than
+# forked from a threaded server process, so scripts that hash must keep their
+# entry point under `if __name__ == '__main__':`. A hash that times out keeps its slot
+# until the worker is actually done with it, so timeouts can't let more
+# hashes in flight than HASH_MAX_PENDING.
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing queue is full or a hash timed out"""
+
+
+def hash_password(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def check_password(hashed, password):
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    except ValueError:
+        return False
+
+
+def hash_rounds(hashed):
+    """Cost factor stored in a bcrypt hash ($2b$<rounds>$...)"""
+    try:
+        return int(hashed.split('$')[2])
+    except (IndexError, ValueError):
+        return None
+
+
+class HashingPool:
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self, workers):
+        with self._lock:
+            if self._executor is None:
+                # Only once hashing starts
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+            return self._executor
+
+    def _admit(self, config):
+        with self._lock:
+            if self.pending >= config['HASH_MAX_PENDING']:
+                self.rejected += 1
+                raise HashingBusy('password hashing queue is full')
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+
+    def _release(self):
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+
+    def _submit(self, config, fn, args):
+        """Admit and submit one hash; returns None when hashing inline"""
+        self._admit(config)
+        if not config['HASH_WORKERS']:
+            return None
+        try:
+            future = self._get_executor(config['HASH_WORKERS']).submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        # Free the slot when the worker is done (or the hash is cancelled
+        # before it starts), not when the caller stops waiting
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _run(self, fn, *args):
+        config = current_app.config
+        future = self._submit(config, fn, args)
+        if future is None:
+            try:
+                return fn(*args)
+            finally:
+                self._release()
+        try:
+            return future.result(timeout=config['HASH_TIMEOUT'])
+        except TimeoutError:
+            future.cancel()
+            raise HashingBusy('password hashing timed out')
+
+    async def _run_async(self, fn, *args):
+        # Same admission control, but the event loop keeps serving while it waits
+        config = current_app.config
+        future = self._submit(config, fn, args)
+        if future is None:
+            try:
+                return fn(*args)
+            finally:
+                self._release()
+        try:
+            # Timing out cancels the wrapper, which cancels the hash if it is still queued
+            return await asyncio.wait_for(asyncio.wrap_future(future), config['HASH_TIMEOUT'])
+        except asyncio.TimeoutError:
+            raise HashingBusy('password hashing timed out')
+
+    def hash_password(self, password):
+        return self._run(hash_password, password, current_app.config['BCRYPT_LOG_ROUNDS'])
+
+    def check_password(self, hashed, password):
+        return self._run(check_password, hashed, password)
+
+    async def hash_password_async(self, password):
+        return await self._run_async(hash_password, password, current_app.config['BCRYPT_LOG_ROUNDS'])
+
+    async def check_password_async(self, hashed, password):
+        return await self._run_async(check_password, hashed, password)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": self.pending,
+                "peak_pending": self.peak_pending,
+                "completed": self.completed,
+                "rejected": self.rejected
+            }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+
+hasher = HashingPool()
@@ -0,0 +1,186 @@
+# app/importer.py
+import csv
+import json
+import time
+from sqlalchemy.exc import SQLAlchemyError
+from .events import RESET, get_broker
+from .extensions import db
+from .models import Category, Product, InventoryVersion, SyncEntry
+from .search import optimize_search_index
+
+# -------------------------------------------------
+# Streaming product import (CSV / NDJSON)
+# -------------------------------------------------
+# Shared by POST /products/import and the `flask import-products` command.
+# Records are parsed one at a time from the file, category names are resolved
+# from a map built once up front, and rows go in through core insert()s
+# committed every `chunk_size` rows. Records that aren't valid UTF-8, CSV or
+# JSON objects, rows without a name or category, and rows whose name is
+# already taken (in the database or earlier in the chunk) are skipped and
+# reported by physical line number; the rest of the file still goes in. If a
+# chunk fails to commit, everything before it stays committed and `committed`
+# (the last line of the last committed chunk) is what the caller passes back
+# as `skip` to resume. Subscribers get one `reset` event once the import is
+# over.
+
+FORMATS = ('csv', 'ndjson')
+
+
+def iter_records(stream, fmt):
+    """Yield (line, record, error) from a binary stream without reading it all in
+
+    ``line`` is the physical line the record ends on. A record that can't be
+    decoded or parsed comes back as (line, None, error) and reading goes on.
+    """
+    if fmt == 'csv':
+        yield from iter_csv_records(stream)
+        return
+    for line, raw in enumerate(stream, start=1):
+        if not raw.strip():
+            continue
+        try:
+            record = json.loads(raw.decode('utf-8'))
+        except UnicodeDecodeError:
+            yield line, None, "invalid UTF-8"
+            continue
+        except ValueError:
+            yield line, None, "invalid JSON"
+            continue
+        if not isinstance(record, dict):
+            yield line, None, "record must be an object"
+            continue
+        yield line, record, None
+
+
+def iter_csv_records(stream):
+    bad_lines = set()
+    reader = csv.DictReader(decoded_lines(stream, bad_lines))
+    last = 1    # the header
+    while True:
+        try:
+            record = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            last += 1
+            yield last, None, f"invalid CSV: {e}"
+            continue
+        first, last = last + 1, reader.line_num
+        if bad_lines.intersection(range(first, last + 1)):
+            yield last, None, "invalid UTF-8"
+        else:
+            yield last, record, None
+
+
+def decoded_lines(stream, bad_lines):
+    """Text lines of ``stream``, noting the numbers of lines that aren't UTF-8"""
+    for line, raw in enumerate(stream, start=1):
+        try:
+            yield raw.decode('utf-8')
+        except UnicodeDecodeError:
+            bad_lines.add(line)
+            yield raw.decode('utf-8', 'replace')
+
+
+def import_products(stream, fmt, user_id, chunk_size=5000, skip=0):
+    """Import records from binary ``stream`` for ``user_id``; returns a summary dict"""
+    categories = dict(db.session.execute(db.select(Category.name, Category.id)).all())
+    category_ids = set(categories.values())
+
+    result = {"committed": skip, "inserted": 0, "errors": [], "rows_per_second": 0.0}
+    start = time.perf_counter()
+    chunk = {}      # name -> (line, row)
+
+    def flush(line):
+        taken = taken_names(list(chunk))
+        rows = []
+        for name, (row_line, row) in chunk.items():
+            if name in taken:
+                result["errors"].append({"line": row_line, "error": "Product name already exists"})
+            else:
+                rows.append(row)
+        if rows:
+            ids = db.session.execute(
+                db.insert(Product.__table__).returning(Product.__table__.c.id), rows
+            ).scalars().all()
+            InventoryVersion.bump(InventoryVersion.user_key(user_id))
+            SyncEntry.record_many(SyncEntry.PRODUCT, ids, user_id)
+        db.session.commit()
+        result["committed"] = line
+        result["inserted"] += len(rows)
+        chunk.clear()
+
+    line = skip
+    try:
+        for line, record, error in iter_records(stream, fmt):
+            if line <= skip:
+                continue
+            if error is not None:
+                result["errors"].append({"line": line, "error": error})
+                continue
+            name = record.get('name')
+            category_id = resolve_category(record, categories, category_ids)
+            if not name or not isinstance(name, str) or category_id is None:
+                result["errors"].append({"line": line, "error": "name & category required"})
+                continue
+            if not all(isinstance(record.get(field), (str, type(None))) for field in ('rack', 'bin')):
+                result["errors"].append({"line": line, "error": "rack and bin must be strings"})
+                continue
+            if name in chunk:
+                result["errors"].append({"line": line, "error": "Product name already exists"})
+                continue
+            chunk[name] = (line, {
+                "name": name,
+                "rack": record.get('rack') or None,
+                "bin": record.get('bin') or None,
+                "category_id": category_id,
+                "user_id": user_id
+            })
+            if len(chunk) >= chunk_size:
+                flush(line)
+        # Also commits categories created for rows that were then rejected
+        flush(line)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        result["failed"] = str(e).splitlines()[0]
+
+    result["errors"].sort(key=lambda error: error["line"])
+    if result["inserted"]:
+        get_broker().publish(user_id, RESET, {"reason": "import"})
+    if result["inserted"] >= chunk_size:
+        optimize_search_index()
+
+    elapsed = time.perf_counter() - start
+    if elapsed:
+        result["rows_per_second"] = round(result["inserted"] / elapsed, 1)
+    return result
+
+
+def taken_names(names, size=500):
+    """The subset of ``names`` already used by a product"""
+    taken = set()
+    # Keep IN (...) lists well under SQLite's bound-parameter limit
+    for i in range(0, len(names), size):
+        taken.update(db.session.execute(
+            db.select(Product.name).where(Product.name.in_(names[i:i + size]))
+        ).scalars())
+    return taken
+
+
+def resolve_category(record, categories, category_ids):
+    """Map a record's category name (or id) to an id, creating unknown names"""
+    name = record.get('category')
+    if name and isinstance(name, str):
+        if name not in categories:
+            category = Category(name=name)
+            db.session.add(category)
+            db.session.flush()
+            SyncEntry.record(SyncEntry.CATEGORY, category.id)
+            categories[name] = category.id
+            category_ids.add(category.id)
+        return categories[name]
+    try:
+        category_id = int(record.get('category_id'))
+    except (TypeError, ValueError):
+        return None
+    return category_id if category_id in category_ids else None
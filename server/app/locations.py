@@ -0,0 +1,55 @@
+# app/locations.py
+from sqlalchemy import DDL, event
+from .extensions import db
+
+# -------------------------------------------------
+# Warehouse location index
+# -------------------------------------------------
+# Location (rack + bin) and Rack rows carry product counts that triggers on
+# products keep current: +1 on insert, -1 on delete, and -1/+1 when a product
+# moves (rack, bin or owner changes). Rows whose count drops to zero are
+# removed. Being triggers, they cover ORM writes, bulk upserts and imports.
+
+LOCATIONS_DDL = [
+    """CREATE TRIGGER IF NOT EXISTS locations_insert AFTER INSERT ON products
+    WHEN new.rack IS NOT NULL BEGIN
+        INSERT INTO locations (user_id, rack, bin, product_count)
+        VALUES (new.user_id, new.rack, coalesce(new.bin, ''), 1)
+        ON CONFLICT (user_id, rack, bin) DO UPDATE SET product_count = product_count + 1;
+        INSERT INTO racks (user_id, rack, product_count)
+        VALUES (new.user_id, new.rack, 1)
+        ON CONFLICT (user_id, rack) DO UPDATE SET product_count = product_count + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS locations_delete AFTER DELETE ON products
+    WHEN old.rack IS NOT NULL BEGIN
+        UPDATE locations SET product_count = product_count - 1
+        WHERE user_id = old.user_id AND rack = old.rack AND bin = coalesce(old.bin, '');
+        DELETE FROM locations
+        WHERE user_id = old.user_id AND rack = old.rack AND bin = coalesce(old.bin, '') AND product_count <= 0;
+        UPDATE racks SET product_count = product_count - 1
+        WHERE user_id = old.user_id AND rack = old.rack;
+        DELETE FROM racks
+        WHERE user_id = old.user_id AND rack = old.rack AND product_count <= 0;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS locations_move AFTER UPDATE OF rack, bin, user_id ON products
+    WHEN old.rack IS NOT new.rack OR old.bin IS NOT new.bin OR old.user_id IS NOT new.user_id BEGIN
+        UPDATE locations SET product_count = product_count - 1
+        WHERE user_id = old.user_id AND rack = old.rack AND bin = coalesce(old.bin, '');
+        DELETE FROM locations
+        WHERE user_id = old.user_id AND rack = old.rack AND bin = coalesce(old.bin, '') AND product_count <= 0;
+        UPDATE racks SET product_count = product_count - 1
+        WHERE user_id = old.user_id AND rack = old.rack;
+        DELETE FROM racks
+        WHERE user_id = old.user_id AND rack = old.rack AND product_count <= 0;
+        INSERT INTO locations (user_id, rack, bin, product_count)
+        SELECT new.user_id, new.rack, coalesce(new.bin, ''), 1 WHERE new.rack IS NOT NULL
+        ON CONFLICT (user_id, rack, bin) DO UPDATE SET product_count = product_count + 1;
+        INSERT INTO racks (user_id, rack, product_count)
+        SELECT new.user_id, new.rack, 1 WHERE new.rack IS NOT NULL
+        ON CONFLICT (user_id, rack) DO UPDATE SET product_count = product_count + 1;
+    END""",
+]
+
+# Created once every table exists; the triggers go away with the products table
+for statement in LOCATIONS_DDL:
+    event.listen(db.metadata, 'after_create', DDL(statement))
@@ -0,0 +1,204 @@
+# app/metrics.py
+import threading
+import time
+from contextlib import contextmanager
+from flask import Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+from .extensions import db
+from .hashing import hasher
+
+# -------------------------------------------------
+# Request instrumentation (opt-in: METRICS_ENABLED)
+# -------------------------------------------------
+# Every request counts its SQL statements and the time spent in the driver
+# (before/after_cursor_execute on all engines) and, separately, the time
+# spent in the serializers. Totals go out as a Server-Timing header, requests
+# slower than SLOW_REQUEST_MS are logged with their statements, and per-
+# endpoint histograms are served at GET /metrics in Prometheus text format.
+#
+# Serialization time excludes any queries the serializers run themselves
+# (e.g. UserSchema.get_categories), so db + serialize never double-count.
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 500)
+MAX_LOGGED_STATEMENTS = 50
+
+
+class RequestMetrics:
+    __slots__ = ('started', 'statements', 'failed', 'db_time', 'serialize_time', 'queries')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.failed = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.queries = []
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += 1
+        self.sum += value
+
+
+class Registry:
+    """Per (endpoint, method, status) histograms, shared by all request threads"""
+
+    SERIES = {
+        'request_duration_seconds': ('Total request time', BUCKETS),
+        'db_duration_seconds': ('Time spent executing SQL per request', BUCKETS),
+        'serialize_duration_seconds': ('Time spent in serializers per request', BUCKETS),
+        'sql_statements': ('SQL statements executed per request', STATEMENT_BUCKETS),
+    }
+
+    def __init__(self):
+        self._series = {name: {} for name in self.SERIES}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, metrics, duration):
+        values = {
+            'request_duration_seconds': duration,
+            'db_duration_seconds': metrics.db_time,
+            'serialize_duration_seconds': metrics.serialize_time,
+            'sql_statements': metrics.statements,
+        }
+        with self._lock:
+            for name, value in values.items():
+                series = self._series[name]
+                if labels not in series:
+                    series[labels] = Histogram(self.SERIES[name][1])
+                series[labels].observe(value)
+
+    def render(self, prefix='finventory'):
+        lines = []
+        with self._lock:
+            for name, (help_text, _) in self.SERIES.items():
+                metric = f'{prefix}_{name}'
+                lines.append(f'# HELP {metric} {help_text}')
+                lines.append(f'# TYPE {metric} histogram')
+                for labels, histogram in sorted(self._series[name].items()):
+                    base = 'endpoint="{}",method="{}",status="{}"'.format(*labels)
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f'{metric}_bucket{{{base},le="{bound}"}} {count}')
+                    lines.append(f'{metric}_bucket{{{base},le="+Inf"}} {histogram.total}')
+                    lines.append(f'{metric}_sum{{{base}}} {histogram.sum:.6f}')
+                    lines.append(f'{metric}_count{{{base}}} {histogram.total}')
+        pools = {'hash_pool': hasher}
+        if 'edit_batcher' in current_app.extensions:
+            pools['edit_batcher'] = current_app.extensions['edit_batcher']
+        for pool_name, pool in pools.items():
+            for name, value in pool.stats().items():
+                kind = 'gauge' if 'pending' in name else 'counter'
+                metric = f'{prefix}_{pool_name}_{name}' + ('_total' if kind == 'counter' else '')
+                lines.append(f'# TYPE {metric} {kind}')
+                lines.append(f'{metric} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def request_metrics():
+    return g.get('request_metrics') if has_request_context() else None
+
+
+@contextmanager
+def serialization_timer():
+    metrics = request_metrics()
+    if metrics is None:
+        yield
+        return
+    started, db_before = time.perf_counter(), metrics.db_time
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.serialize_time += max(0.0, elapsed - (metrics.db_time - db_before))
+
+
+# -------------------------------------------------
+# Hooks
+# -------------------------------------------------
+def install_sql_hooks(engine):
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        record_statement(time.perf_counter() - conn.info['query_started'].pop(), statement)
+
+    @event.listens_for(engine, 'handle_error')
+    def on_error(exception_context):
+        # A failed statement never reaches after_cursor_execute; pop its start
+        # time here so it can't skew the next statement on this connection
+        conn = exception_context.connection
+        started = conn.info.get('query_started') if conn is not None else None
+        if started:
+            record_statement(time.perf_counter() - started.pop(), exception_context.statement, failed=True)
+
+
+def record_statement(elapsed, statement, failed=False):
+    metrics = request_metrics()
+    if metrics is None:
+        return
+    metrics.statements += 1
+    metrics.failed += failed
+    metrics.db_time += elapsed
+    if len(metrics.queries) < MAX_LOGGED_STATEMENTS:
+        metrics.queries.append((elapsed, f'[failed] {statement}' if failed else statement))
+
+
+def start_request():
+    g.request_metrics = RequestMetrics()
+
+
+def finish_request(response):
+    metrics = g.pop('request_metrics', None)
+    if metrics is None:
+        return response
+    duration = time.perf_counter() - metrics.started
+    failed = f', {metrics.failed} failed' if metrics.failed else ''
+    response.headers['Server-Timing'] = ', '.join([
+        f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.statements} queries{failed}"',
+        f'serialize;dur={metrics.serialize_time * 1000:.1f}',
+        f'total;dur={duration * 1000:.1f}',
+    ])
+
+    labels = (request.endpoint or 'unmatched', request.method, str(response.status_code))
+    current_app.extensions['metrics'].observe(labels, metrics, duration)
+
+    if duration * 1000 >= current_app.config['SLOW_REQUEST_MS']:
+        queries = ''.join(f'\n  {elapsed * 1000:8.2f} ms  {" ".join(statement.split())}'
+                            for elapsed, statement in metrics.queries)
+        current_app.logger.warning(
+            'Slow request %s %s -> %s in %.1f ms (db %.1f ms / %d queries, serialize %.1f ms)%s',
+            request.method, request.path, response.status_code, duration * 1000,
+            metrics.db_time * 1000, metrics.statements, metrics.serialize_time * 1000, queries
+        )
+    return response
+
+
+def metrics_view():
+    body = current_app.extensions['metrics'].render()
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+
+def init_metrics(app):
+    if not app.config['METRICS_ENABLED']:
+        return
+    app.extensions['metrics'] = Registry()
+    with app.app_context():
+        engines = db.engines
+    for engine in engines.values():
+        install_sql_hooks(engine)
+    app.before_request(start_request)
+    app.after_request(finish_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
@@ -1,4 +1,8 @@
-from .extensions import db, ma, bcrypt
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from flask import current_app
+from marshmallow import Schema, fields
+from .extensions import db
+from .hashing import hasher, hash_rounds
 
 # -------------------------------------------------
 # Model
@@ -25,10 +29,14 @@ class User(db.Model):
     @password_hash.setter
     def password_hash(self, password):
         
-        self._password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        self._password_hash = hasher.hash_password(password)
 
     def authenticate(self, password):
-        return bcrypt.check_password_hash(self._password_hash, password)
+        return hasher.check_password(self._password_hash, password)
+
+    def needs_rehash(self):
+        # True once BCRYPT_LOG_ROUNDS no longer matches the stored hash's cost
+        return hash_rounds(self._password_hash) != current_app.config['BCRYPT_LOG_ROUNDS']
     
     def __repr__(self):
         return '<User %r>' % self.name
@@ -51,6 +59,15 @@ class Category(db.Model):
     
 class Product(db.Model):
     __tablename__ = 'products'
+    # Every route scopes products to the logged-in user, so user_id leads each
+    # index (existing databases get them from `flask db upgrade`)
+    __table_args__ = (
+        db.Index('ix_products_user_id', 'user_id'),
+        db.Index('ix_products_user_id_category_id', 'user_id', 'category_id'),
+        db.Index('ix_products_user_id_rack_bin', 'user_id', 'rack', 'bin'),
+        db.Index('ix_products_user_id_name', 'user_id', 'name'),
+        db.Index('ix_products_category_id', 'category_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(80), unique=True, nullable=False)
     rack = db.Column(db.String(80), nullable=True)
@@ -64,57 +81,210 @@ class Product(db.Model):
     def __repr__(self):
         return '<Product %r>' % self.name 
 
+class Location(db.Model):
+    # One row per occupied (user, rack, bin), with its product count. Rows are
+    # maintained by triggers on products (app/locations.py); a product with a
+    # rack but no bin is counted under bin ''.
+    __tablename__ = 'locations'
+    __table_args__ = (db.UniqueConstraint('user_id', 'rack', 'bin'),)
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    rack = db.Column(db.String(80), nullable=False)
+    bin = db.Column(db.String(80), nullable=False, default='')
+    product_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return '<Location %s/%s>' % (self.rack, self.bin)
+
+class Rack(db.Model):
+    # Precomputed per-rack product counts, maintained alongside Location
+    __tablename__ = 'racks'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    rack = db.Column(db.String(80), primary_key=True)
+    product_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return '<Rack %r>' % self.rack
+
+class CategoryCount(db.Model):
+    # Products per (user, category), maintained by triggers (app/stats.py)
+    __tablename__ = 'category_counts'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), primary_key=True)
+    product_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return '<CategoryCount %r/%r=%r>' % (self.user_id, self.category_id, self.product_count)
+
+class UserCount(db.Model):
+    # Products per user, maintained by triggers (app/stats.py)
+    __tablename__ = 'user_counts'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    product_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return '<UserCount %r=%r>' % (self.user_id, self.product_count)
+
+class InventoryVersion(db.Model):
+    # Monotonic counters behind the ETags: one row per user ("user:<id>")
+    # plus a global "categories" row for the shared category catalog and the
+    # global "sync" sequence used by SyncEntry
+    __tablename__ = 'inventory_versions'
+    key = db.Column(db.String(40), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    CATEGORIES = 'categories'
+    SYNC = 'sync'
+
+    @staticmethod
+    def user_key(user_id):
+        return f'user:{user_id}'
+
+    @classmethod
+    def current(cls, key):
+        version = db.session.execute(db.select(cls.version).where(cls.key == key)).scalar()
+        return version or 0
+
+    @classmethod
+    def bump_statement(cls, key):
+        # Upsert in a single statement so it rides along in the caller's transaction
+        stmt = sqlite_insert(cls).values(key=key, version=1)
+        return stmt.on_conflict_do_update(index_elements=[cls.key], set_={'version': cls.version + 1})
+
+    @classmethod
+    def bump(cls, key):
+        db.session.execute(cls.bump_statement(key))
+
+    def __repr__(self):
+        return '<InventoryVersion %r=%r>' % (self.key, self.version)
+
+class SyncEntry(db.Model):
+    # Last change for every product/category, stamped with the global "sync"
+    # sequence. Deletes leave a tombstone row (deleted=True) so /sync can tell
+    # reconnecting clients what to drop. Kept beside the models rather than as
+    # columns on them because tombstones have to outlive the deleted row.
+    __tablename__ = 'sync_entries'
+    # /sync reads one user's entries (plus the shared user_id NULL ones) by seq
+    __table_args__ = (db.Index('ix_sync_entries_user_id_seq', 'user_id', 'seq'),)
+    entity = db.Column(db.String(10), primary_key=True)
+    entity_id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=True)  # None for categories (shared)
+    seq = db.Column(db.Integer, nullable=False, index=True)
+    deleted = db.Column(db.Boolean, nullable=False, default=False)
+
+    PRODUCT = 'product'
+    CATEGORY = 'category'
+
+    @classmethod
+    def record(cls, entity, entity_id, user_id=None, deleted=False):
+        cls.record_many(entity, [entity_id], user_id, deleted)
+
+    @classmethod
+    def record_many(cls, entity, entity_ids, user_id=None, deleted=False):
+        # One sequence bump per call; every id in the batch shares the new seq
+        if not entity_ids:
+            return
+        InventoryVersion.bump(InventoryVersion.SYNC)
+        seq = InventoryVersion.current(InventoryVersion.SYNC)
+        stmt = sqlite_insert(cls)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.entity, cls.entity_id],
+            set_={'user_id': stmt.excluded.user_id, 'seq': stmt.excluded.seq, 'deleted': stmt.excluded.deleted}
+        )
+        db.session.execute(stmt, [
+            {'entity': entity, 'entity_id': entity_id, 'user_id': user_id, 'seq': seq, 'deleted': deleted}
+            for entity_id in entity_ids
+        ])
+
+    @classmethod
+    def backfill(cls):
+        """Record every product and category that has no entry yet, at one new seq"""
+        InventoryVersion.bump(InventoryVersion.SYNC)
+        seq = InventoryVersion.current(InventoryVersion.SYNC)
+        for entity, table, owner in ((cls.PRODUCT, Product.__table__, Product.__table__.c.user_id),
+                                     (cls.CATEGORY, Category.__table__, db.null())):
+            recorded = db.select(cls.entity_id).where(cls.entity == entity)
+            db.session.execute(db.insert(cls).from_select(
+                ['entity', 'entity_id', 'user_id', 'seq', 'deleted'],
+                db.select(db.literal(entity), table.c.id, owner, db.literal(seq), db.false())
+                .where(table.c.id.not_in(recorded))
+            ))
+
+    def __repr__(self):
+        return '<SyncEntry %s:%r@%r>' % (self.entity, self.entity_id, self.seq)
+
+
+class SessionRecord(db.Model):
+    # Server-side session storage for SESSION_BACKEND = 'sqlite' (app/sessions.py)
+    __tablename__ = 'sessions'
+    id = db.Column(db.String(64), primary_key=True)
+    data = db.Column(db.Text, nullable=False)
+    expires_at = db.Column(db.Float, nullable=False, index=True)
+
+    @classmethod
+    def upsert_statement(cls, sid, data, expires_at):
+        stmt = sqlite_insert(cls).values(id=sid, data=data, expires_at=expires_at)
+        return stmt.on_conflict_do_update(
+            index_elements=[cls.id],
+            set_={'data': stmt.excluded.data, 'expires_at': stmt.excluded.expires_at}
+        )
+
+    def __repr__(self):
+        return '<SessionRecord %r>' % self.id
+
 
 # ------------------------------
 
 # Schema
 # -------------------------------------------------
-class UserSchema(ma.SQLAlchemyAutoSchema):
-    class Meta:
-        model = User
-        load_instance = True
-        exclude = ('_password_hash',)
-
-    id = ma.auto_field()
-    name = ma.auto_field()
-    categories = ma.Method("get_categories")
+# Plain marshmallow schemas with the fields the SQLAlchemy auto-schemas used
+# to generate at import time; nullable columns allow None.
+class UserSchema(Schema):
+    id = fields.Integer()
+    name = fields.String()
+    categories = fields.Method("get_categories")
 
     def get_categories(self, user):
+        # One joined query for all of the user's products, grouped in memory
+        rows = (db.session.query(Product, Category)
+                .join(Category, Product.category_id == Category.id)
+                .filter(Product.user_id == user.id)
+                .order_by(Product.category_id, Product.id)
+                .all())
+
         result = []
-        for cat in user.categories:
-            products = Product.query.filter_by(user_id=user.id, category_id=cat.id).all()
-            result.append({
-                "id": cat.id,
-                "name": cat.name,
-                "products": ProductSchema(many=True).dump(products)
-            })
+        grouped = {}
+        for product, cat in rows:
+            if cat.id not in grouped:
+                grouped[cat.id] = []
+                result.append({
+                    "id": cat.id,
+                    "name": cat.name,
+                    "products": grouped[cat.id]
+                })
+            grouped[cat.id].append(product)
+
+        for entry in result:
+            entry["products"] = products_schema.dump(entry["products"])
         return result
 
 user_schema = UserSchema()
 users_schema = UserSchema(many=True)
 
-class CategorySchema(ma.SQLAlchemyAutoSchema):
-    class Meta:
-        model = Category
-        load_instance = True
-
-    id = ma.auto_field()
-    name = ma.auto_field()
+class CategorySchema(Schema):
+    id = fields.Integer()
+    name = fields.String()
 
 category_schema = CategorySchema()  
 categories_schema = CategorySchema(many=True)
 
-class ProductSchema(ma.SQLAlchemyAutoSchema):
-    class Meta:
-        model = Product
-        load_instance = True
-
-    id = ma.auto_field()
-    name = ma.auto_field()
-    rack = ma.auto_field()
-    bin = ma.auto_field()
-    category_id = ma.auto_field()
-    user_id = ma.auto_field()
+class ProductSchema(Schema):
+    id = fields.Integer()
+    name = fields.String()
+    rack = fields.String(allow_none=True)
+    bin = fields.String(allow_none=True)
+    category_id = fields.Integer()
+    user_id = fields.Integer()
 
 product_schema = ProductSchema()
 products_schema = ProductSchema(many=True)
@@ -1,16 +1,85 @@
 # app/routes.py
-from flask import Blueprint, session, request, jsonify, render_template_string
-from .models import User, Category, Product
-from .models import user_schema, users_schema, category_schema, categories_schema, product_schema, products_schema
-from .extensions import db, bcrypt
+import base64
+import csv
+import io
+import json
+from flask import Blueprint, session, request, jsonify, render_template_string, current_app, g
+from flask import Response, stream_with_context
+from sqlalchemy.exc import IntegrityError
+from .models import User, Category, Product, InventoryVersion, SyncEntry, Location, Rack, CategoryCount, UserCount
+from .serializers import user_serializer as user_schema, category_serializer as category_schema, categories_serializer as categories_schema, product_serializer as product_schema, products_serializer as products_schema
+from .extensions import db
+from .hashing import HashingBusy
+from .batching import NameTaken, WriteQueueFull
+from .search import search_products
+from .cache import drop_cached_catalog, get_cached_catalog, set_cached_catalog
+from .events import RESET, format_event, get_broker, queue_event
+from .columnar import COLUMNAR_MIMETYPE, dump_user_columnar, wants_columnar
+from . import locations, stats  # register the summary-table triggers
+from .importer import FORMATS as IMPORT_FORMATS, import_products
 
 bp = Blueprint('main', __name__, url_prefix='')
 
+# -------------------------------------------------
+# Identity
+# -------------------------------------------------
+def current_user():
+    # Load the logged-in user at most once per request
+    if 'current_user' not in g:
+        g.current_user = db.session.get(User, session['user_id'])
+    return g.current_user
+
+# -------------------------------------------------
+# Conditional GET
+# -------------------------------------------------
+def user_etag(user_id):
+    key = InventoryVersion.user_key(user_id)
+    return f'{key}-v{InventoryVersion.current(key)}'
+
+def conditional_response(etag, build):
+    # Answer If-None-Match hits with a 304 before anything is serialized
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        body = build()
+        if isinstance(body, bytes):
+            # Already-serialized JSON (e.g. from the catalog cache)
+            response = current_app.response_class(body, mimetype='application/json')
+        else:
+            response = jsonify(body)
+    response.set_etag(etag)
+    return response
+
+def with_sync_version(dump, user):
+    # Stamp a snapshot with the sync sequence it is current to, read before
+    # the tree so GET /sync?since=<it> can repeat changes but never miss one
+    sync_version = InventoryVersion.current(InventoryVersion.SYNC)
+    return {**dump(user), "sync_version": sync_version}
+
+def user_snapshot(etag, wrap=lambda user: user):
+    # The nested user tree, or the columnar snapshot when the client's Accept
+    # asks for it (app/columnar.py); each has its own ETag
+    if wants_columnar():
+        response = conditional_response(
+            f'{etag}-columnar', lambda: wrap(with_sync_version(dump_user_columnar, current_user())))
+        if response.status_code == 200:
+            response.mimetype = COLUMNAR_MIMETYPE
+    else:
+        response = conditional_response(etag, lambda: wrap(with_sync_version(user_schema.dump, current_user())))
+    response.vary.add('Accept')
+    return response
+
 # -------------------------------------------------
 # Routes (API)
 # -------------------------------------------------
 
 # Auth #
+def busy_response():
+    response = jsonify({"error": "Server busy, try again shortly"})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
 @bp.route('/signup', methods=['POST'])
 def signup():
     data = request.get_json()
@@ -19,8 +88,13 @@ def signup():
     if User.query.filter_by(name=data['name']).first():
         return jsonify({"error": "Username taken"}), 409
     user = User(name=data['name'])
-    user.password_hash = data['password']
+    try:
+        user.password_hash = data['password']
+    except HashingBusy:
+        return busy_response()
     db.session.add(user)
+    db.session.flush()
+    InventoryVersion.bump(InventoryVersion.user_key(user.id))
     db.session.commit()
     return user_schema.dump(user), 201
 
@@ -31,10 +105,18 @@ def login():
     if not data or 'name' not in data or 'password' not in data:
         return jsonify({"error": "name & password required"}), 400
     user = User.query.filter_by(name=data['name']).first()
-    if user and user.authenticate(data['password']):
+    try:
+        authenticated = user and user.authenticate(data['password'])
+        if authenticated and user.needs_rehash():
+            # Transparently upgrade the stored hash to the configured cost
+            user.password_hash = data['password']
+            db.session.commit()
+    except HashingBusy:
+        return busy_response()
+    if authenticated:
         session['user_id'] = user.id
         session['name'] = user.name
-        return user_schema.dump(user), 200
+        return with_sync_version(user_schema.dump, user), 200
     return jsonify({"error": "Invalid credentials"}), 401
 
 @bp.route('/logout', methods=['POST'])
@@ -46,24 +128,42 @@ def logout():
 def profile():
     if 'user_id' not in session:
         return jsonify({"error": "Login required"}), 401
-    user = User.query.get(session['user_id'])
-    return jsonify(user_schema.dump(user))
+    return user_snapshot(user_etag(session['user_id']))
 
 @bp.route('/check_session')
 def check_session():
+    # ?shallow=1 answers from the signed session cookie alone, no database hit
+    # (add &version=1 for the inventory version stamp, one primary-key lookup)
+    if request.args.get('shallow', type=int):
+        if 'user_id' in session:
+            user = {"id": session['user_id'], "name": session.get('name')}
+            if request.args.get('version', type=int):
+                user["version"] = InventoryVersion.current(InventoryVersion.user_key(session['user_id']))
+            return jsonify({"logged_in": True, "user": user})
+        return jsonify({"logged_in": False})
+
     if 'user_id' in session:
-        user = User.query.get(session['user_id'])
-        return jsonify({
-            "logged_in": True,
-            "user": user_schema.dump(user)
-        })
+        etag = user_etag(session['user_id'])
+        return user_snapshot(etag, lambda user: {"logged_in": True, "user": user})
     return jsonify({"logged_in": False})
 
 # Categories #
 @bp.route('/categories', methods=['GET'])
 def get_categories():
-    categories = Category.query.all()
-    return jsonify(categories_schema.dump(categories))
+    # Cache hits answer from the stored body and ETag without touching the ORM
+    cached = get_cached_catalog()
+    if cached is None:
+        version = InventoryVersion.current(InventoryVersion.CATEGORIES)
+        etag = f'{InventoryVersion.CATEGORIES}-v{version}'
+        body = current_app.json.response(categories_schema.dump(Category.query.all())).get_data()
+        set_cached_catalog(etag, body)
+        # Re-check outside the read transaction (see app/cache.py)
+        db.session.rollback()
+        if InventoryVersion.current(InventoryVersion.CATEGORIES) != version:
+            drop_cached_catalog()
+    else:
+        etag, body = cached
+    return conditional_response(etag, lambda: body)
 
 
 @bp.route('/categories/new', methods=['POST'])
@@ -79,11 +179,88 @@ def create_category():
     
     new_category = Category(name=category_name)
     db.session.add(new_category)
+    db.session.flush()
+    SyncEntry.record(SyncEntry.CATEGORY, new_category.id)
     db.session.commit()
     return category_schema.dump(new_category), 201
 
 
 # Products  #
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def decode_cursor(cursor):
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        return None
+
+def products_page_statement(user_id, args):
+    """Select for one GET /products page (limit + 1 rows); ValueError on bad args"""
+    sort = args.get('sort', 'id')
+    if sort not in ('id', 'name'):
+        raise ValueError("sort must be id or name")
+
+    max_limit = current_app.config['PRODUCTS_PAGE_MAX']
+    limit = args.get('limit', current_app.config['PRODUCTS_PAGE_SIZE'], type=int)
+    limit = max(1, min(limit, max_limit))
+
+    stmt = db.select(Product).where(Product.user_id == user_id)
+    for field in ('category_id', 'rack', 'bin'):
+        if field in args:
+            stmt = stmt.where(getattr(Product, field) == args[field])
+
+    # Keyset pagination: seek past the last row of the previous page
+    # instead of OFFSET, so every page costs the same
+    cursor = args.get('cursor')
+    if cursor:
+        last = decode_cursor(cursor)
+        types = (str, int) if sort == 'name' else (int,)
+        if (not isinstance(last, list) or len(last) != len(types)
+                or not all(type(value) is kind for value, kind in zip(last, types))):
+            raise ValueError("Invalid cursor")
+        if sort == 'name':
+            stmt = stmt.where(db.tuple_(Product.name, Product.id) > db.tuple_(*last))
+        else:
+            stmt = stmt.where(Product.id > last[0])
+
+    if sort == 'name':
+        stmt = stmt.order_by(Product.name, Product.id)
+    else:
+        stmt = stmt.order_by(Product.id)
+
+    # Fetch one extra row to know whether another page exists
+    return stmt.limit(limit + 1), sort, limit
+
+def products_page(products, sort, limit):
+    next_cursor = None
+    if len(products) > limit:
+        products = products[:limit]
+        last = products[-1]
+        next_cursor = encode_cursor([last.name, last.id] if sort == 'name' else [last.id])
+    return {
+        "products": products_schema.dump(products),
+        "next_cursor": next_cursor
+    }
+
+@bp.route('/products', methods=['GET'])
+def list_products():
+    # Check if logged in
+    if 'user_id' not in session:
+        return jsonify({"error": "Login required"}), 401
+
+    try:
+        stmt, sort, limit = products_page_statement(session['user_id'], request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    products = db.session.scalars(stmt).all()
+    return jsonify(products_page(products, sort, limit))
+
+def location_value(value):
+    # Store a blank rack or bin as NULL: /locations/<rack>/<bin> can't address ''
+    return None if value == '' else value
+
 @bp.route('/products/new', methods=['POST'])
 def create_product():
     # Check if logged in
@@ -96,15 +273,246 @@ def create_product():
     
     new_product = Product(
         name=data['name'], 
-        rack=data.get('rack'),
-        bin=data.get('bin'), 
+        rack=location_value(data.get('rack')),
+        bin=location_value(data.get('bin')), 
         category_id=data['category_id'], 
         user_id=session['user_id']  # Always use logged-in user's ID
     )
     db.session.add(new_product)
+    db.session.flush()
+    InventoryVersion.bump(InventoryVersion.user_key(session['user_id']))
+    SyncEntry.record(SyncEntry.PRODUCT, new_product.id, session['user_id'])
     db.session.commit()
     return product_schema.dump(new_product), 201
 
+@bp.route('/products/search', methods=['GET'])
+def search():
+    # Check if logged in
+    if 'user_id' not in session:
+        return jsonify({"error": "Login required"}), 401
+
+    q = request.args.get('q', '').strip()
+    if not q:
+        return jsonify({"error": "q is required"}), 400
+    limit = request.args.get('limit', current_app.config['PRODUCTS_PAGE_SIZE'], type=int)
+    limit = max(1, min(limit, current_app.config['PRODUCTS_PAGE_MAX']))
+
+    products = search_products(q, session['user_id'], limit)
+    return jsonify(products_schema.dump(products))
+
+EXPORT_COLUMNS = ('id', 'name', 'rack', 'bin', 'category_id', 'category', 'user_id')
+
+@bp.route('/products/export', methods=['GET'])
+def export_products():
+    # Check if logged in
+    if 'user_id' not in session:
+        return jsonify({"error": "Login required"}), 401
+
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in ('ndjson', 'csv'):
+        return jsonify({"error": "format must be ndjson or csv"}), 400
+
+    # Server-side cursor: rows are fetched yield_per at a time while the
+    # response is being written, so memory stays flat however large the export
+    stmt = (db.select(Product.id, Product.name, Product.rack, Product.bin,
+                      Product.category_id, Category.name, Product.user_id)
+            .join(Category, Product.category_id == Category.id)
+            .where(Product.user_id == session['user_id'])
+            .order_by(Product.id)
+            .execution_options(yield_per=current_app.config['EXPORT_BATCH_SIZE']))
+
+    def generate():
+        result = db.session.execute(stmt)
+        if fmt == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            for batch in result.partitions():
+                writer.writerows(batch)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            yield buffer.getvalue()
+        else:
+            for batch in result.partitions():
+                yield ''.join(json.dumps(dict(zip(EXPORT_COLUMNS, row))) + '\n' for row in batch)
+
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    return Response(stream_with_context(generate()), mimetype=mimetype, headers={
+        "Content-Disposition": f"attachment; filename=products.{fmt}"
+    })
+
+@bp.route('/products/import', methods=['POST'])
+def import_products_upload():
+    # Check if logged in
+    if 'user_id' not in session:
+        return jsonify({"error": "Login required"}), 401
+
+    upload = request.files.get('file')
+    fmt = request.args.get('format')
+    if not fmt and upload and upload.filename:
+        fmt = 'csv' if upload.filename.endswith('.csv') else 'ndjson'
+    if fmt not in IMPORT_FORMATS:
+        return jsonify({"error": "format must be csv or ndjson"}), 400
+
+    chunk_size = request.args.get('chunk_size', 5000, type=int)
+    skip = request.args.get('skip', 0, type=int)
+
+    # Read the upload (multipart "file" or the raw body) as a stream
+    stream = upload.stream if upload else request.stream
+    result = import_products(stream, fmt, session['user_id'], chunk_size=max(1, chunk_size), skip=skip)
+    if 'failed' in result:
+        status = 500
+    elif result["errors"] and not result["inserted"]:
+        # Nothing in the file could be imported
+        status = 400
+    else:
+        status = 200
+    return jsonify(result), status
+
+def chunked(items, size=500):
+    # Keep IN (...) lists well under SQLite's bound-parameter limit
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def bulk_item_error(item):
+    """What is wrong with the types of one bulk upsert item, or None"""
+    if not isinstance(item, dict) or not isinstance(item.get('name'), str) or not item['name']:
+        return "name is required"
+    if item.get('id') is not None and type(item['id']) is not int:
+        return "id must be an integer"
+    if 'category_id' in item and type(item['category_id']) is not int:
+        return "category_id must be an integer"
+    if not all(isinstance(item.get(field), (str, type(None))) for field in ('rack', 'bin')):
+        return "rack and bin must be strings"
+    return None
+
+@bp.route('/products/bulk', methods=['POST'])
+def bulk_products():
+    # Check if logged in
+    if 'user_id' not in session:
+        return jsonify({"error": "Login required"}), 401
+
+    data = request.get_json(silent=True)
+    upserts = data.get('upserts', []) if isinstance(data, dict) else None
+    deletes = data.get('deletes', []) if isinstance(data, dict) else None
+    if not isinstance(upserts, list) or not isinstance(deletes, list):
+        return jsonify({"error": "upserts and/or deletes lists required"}), 400
+    if len(upserts) + len(deletes) > current_app.config['BULK_MAX_ITEMS']:
+        return jsonify({"error": "Too many items in one batch"}), 413
+
+    user_id = session['user_id']
+    errors = []
+
+    # Type checks first, so only well-formed values reach the sets below
+    candidates = []
+    for index, item in enumerate(upserts):
+        error = bulk_item_error(item)
+        if error:
+            errors.append({"index": index, "op": "upsert", "error": error})
+        else:
+            candidates.append((index, item))
+    delete_candidates = []
+    for index, product_id in enumerate(deletes):
+        if type(product_id) is not int:
+            errors.append({"index": index, "op": "delete", "error": "id must be an integer"})
+        else:
+            delete_candidates.append((index, product_id))
+
+    # Ownership and existence checks: a few set lookups instead of one query per row
+    touched = {item['id'] for _, item in candidates if item.get('id') is not None}
+    touched |= {product_id for _, product_id in delete_candidates}
+    owned = set()
+    for chunk in chunked(touched):
+        owned.update(db.session.execute(
+            db.select(Product.id).where(Product.user_id == user_id, Product.id.in_(chunk))
+        ).scalars())
+    category_ids = set()
+    for chunk in chunked({item['category_id'] for _, item in candidates if 'category_id' in item}):
+        category_ids.update(db.session.execute(
+            db.select(Category.id).where(Category.id.in_(chunk))
+        ).scalars())
+
+    names = {item['name'] for _, item in candidates}
+    taken = {}
+    for chunk in chunked(names):
+        taken.update(db.session.execute(
+            db.select(Product.name, Product.id).where(Product.name.in_(chunk))
+        ).all())
+
+    inserts, updates, seen_names = [], [], set()
+    for index, item in candidates:
+        product_id = item.get('id')
+        if product_id is not None and product_id not in owned:
+            errors.append({"index": index, "op": "upsert", "error": "Product not found"})
+            continue
+        if product_id is None and 'category_id' not in item:
+            errors.append({"index": index, "op": "upsert", "error": "name & category_id required"})
+            continue
+        if 'category_id' in item and item['category_id'] not in category_ids:
+            errors.append({"index": index, "op": "upsert", "error": "Category not found"})
+            continue
+        if item['name'] in seen_names or taken.get(item['name'], product_id) != product_id:
+            errors.append({"index": index, "op": "upsert", "error": "Product name already exists"})
+            continue
+        seen_names.add(item['name'])
+
+        row = {field: item[field] for field in ('name', 'rack', 'bin', 'category_id') if field in item}
+        for field in ('rack', 'bin'):
+            if field in row:
+                row[field] = location_value(row[field])
+        if product_id is None:
+            row.setdefault('rack', None)
+            row.setdefault('bin', None)
+            row['user_id'] = user_id
+            inserts.append(row)
+        else:
+            row['id'] = product_id
+            updates.append(row)
+
+    delete_ids = []
+    for index, product_id in delete_candidates:
+        if product_id not in owned:
+            errors.append({"index": index, "op": "delete", "error": "Product not found"})
+            continue
+        delete_ids.append(product_id)
+    errors.sort(key=lambda error: (error["op"] == "delete", error["index"]))
+
+    # Apply everything that validated in one transaction
+    created = []
+    try:
+        if inserts:
+            created = db.session.execute(
+                db.insert(Product).returning(
+                    Product.id, Product.name, Product.rack, Product.bin,
+                    Product.category_id, Product.user_id,
+                    sort_by_parameter_order=True
+                ),
+                inserts
+            ).all()
+        if updates:
+            db.session.execute(db.update(Product), updates)
+        for chunk in chunked(delete_ids):
+            db.session.execute(db.delete(Product).where(Product.id.in_(chunk)))
+
+        if created or updates or delete_ids:
+            InventoryVersion.bump(InventoryVersion.user_key(user_id))
+            SyncEntry.record_many(SyncEntry.PRODUCT, [row.id for row in created] + [row['id'] for row in updates], user_id)
+            SyncEntry.record_many(SyncEntry.PRODUCT, delete_ids, user_id, deleted=True)
+            queue_event(db.session, user_id, RESET, {"reason": "bulk"})
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"error": "Batch conflicts with existing products", "errors": errors}), 409
+
+    return jsonify({
+        "created": [dict(row._mapping) for row in created],
+        "updated": [row['id'] for row in updates],
+        "deleted": delete_ids,
+        "errors": errors
+    }), 200
+
 @bp.route('/products/<int:id>/edit', methods=['PATCH'])
 def update_product(id):
     # Check if logged in
@@ -119,18 +527,54 @@ def update_product(id):
     data = request.get_json()
     if not data or 'name' not in data:
         return jsonify({"error": "name is required"}), 400
+
+    batcher = current_app.extensions.get('edit_batcher')
+    if batcher is not None:
+        return queue_product_edit(batcher, product, data)
     
     product.name = data['name']
     if 'rack' in data:
-        product.rack = data['rack']
+        product.rack = location_value(data['rack'])
     if 'bin' in data:
-        product.bin = data['bin']
+        product.bin = location_value(data['bin'])
     if 'category_id' in data:
         product.category_id = data['category_id']
     
+    InventoryVersion.bump(InventoryVersion.user_key(session['user_id']))
+    SyncEntry.record(SyncEntry.PRODUCT, product.id, session['user_id'])
     db.session.commit()
     return product_schema.dump(product), 200
 
+def queue_product_edit(batcher, product, data):
+    # Group-commit mode (app/batching.py): acknowledge with 202 once queued,
+    # or wait for the batch to commit with ?durable=1
+    # Reject name clashes up front: a 202 can't be taken back if the batch fails
+    if Product.query.filter(Product.name == data['name'], Product.id != product.id).first():
+        return jsonify({"error": "Product name already exists"}), 409
+    changes = {"name": data['name']}
+    for field in ('rack', 'bin'):
+        if field in data:
+            changes[field] = location_value(data[field])
+    if 'category_id' in data:
+        changes['category_id'] = data['category_id']
+    try:
+        merged, committed = batcher.submit(product.id, product.user_id, changes)
+    except WriteQueueFull:
+        return busy_response()
+    except NameTaken:
+        return jsonify({"error": "Product name already exists"}), 409
+    body = {**product_schema.dump(product), **merged}
+
+    if not request.args.get('durable', type=int):
+        return jsonify(body), 202
+    try:
+        committed.result(timeout=current_app.config['WRITE_BATCH_TIMEOUT'])
+    except TimeoutError:
+        return busy_response()
+    except Exception:
+        return jsonify({"error": "Edit could not be saved"}), 409
+    return jsonify(body), 200
+
 @bp.route('/products/<int:id>', methods=['DELETE'])
 def delete_product(id):
     # Check if logged in
@@ -143,13 +587,193 @@ def delete_product(id):
         return jsonify({"error": "Product not found"}), 404
     
     db.session.delete(product)
+    InventoryVersion.bump(InventoryVersion.user_key(session['user_id']))
+    SyncEntry.record(SyncEntry.PRODUCT, id, session['user_id'], deleted=True)
     db.session.commit()
     return jsonify({"message": "Product deleted"}), 200
 
 
+# Events #
+@bp.route('/events', methods=['GET'])
+def events():
+    # Server-Sent Events stream of the user's inventory changes (app/events.py)
+    if 'user_id' not in session:
+        return jsonify({"error": "Login required"}), 401
+
+    broker = get_broker()
+    last_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    subscription = broker.subscribe(session['user_id'], last_id)
+    heartbeat = current_app.config['EVENTS_HEARTBEAT']
+
+    # Runs after the request context is gone, so it holds no DB connection
+    def stream():
+        try:
+            yield 'retry: 3000\n\n'
+            while not subscription.closed:
+                items = subscription.get(timeout=heartbeat)
+                if not items:
+                    yield ': keep-alive\n\n'
+                for item in items:
+                    yield format_event(*item)
+        finally:
+            broker.unsubscribe(subscription)
+
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+# Locations #
+@bp.route('/locations', methods=['GET'])
+def get_locations():
+    # Check if logged in
+    if 'user_id' not in session:
+        return jsonify({"error": "Login required"}), 401
+
+    racks = Rack.query.filter_by(user_id=session['user_id']).order_by(Rack.rack).all()
+    return jsonify([{"rack": r.rack, "product_count": r.product_count} for r in racks])
+
+@bp.route('/locations/<rack>', methods=['GET'])
+def get_rack(rack):
+    # Check if logged in
+    if 'user_id' not in session:
+        return jsonify({"error": "Login required"}), 401
+
+    summary = db.session.get(Rack, (session['user_id'], rack))
+    if not summary:
+        return jsonify({"error": "Rack not found"}), 404
+
+    bins = (Location.query.filter_by(user_id=session['user_id'], rack=rack)
+            .order_by(Location.bin).all())
+    # Products on the rack without a bin have no /locations/<rack>/<bin> URL,
+    # so they are listed here
+    unbinned = []
+    if bins and bins[0].bin == '':
+        unbinned = (Product.query.filter_by(user_id=session['user_id'], rack=rack, bin=None)
+                    .order_by(Product.id).limit(current_app.config['PRODUCTS_PAGE_MAX']).all())
+    return jsonify({
+        "rack": rack,
+        "product_count": summary.product_count,
+        "bins": [{"bin": b.bin or None, "product_count": b.product_count} for b in bins],
+        "unbinned": products_schema.dump(unbinned)
+    })
+
+@bp.route('/locations/<rack>/<bin>', methods=['GET'])
+def get_bin(rack, bin):
+    # Check if logged in
+    if 'user_id' not in session:
+        return jsonify({"error": "Login required"}), 401
+
+    location = Location.query.filter_by(user_id=session['user_id'], rack=rack, bin=bin).first()
+    if not location:
+        return jsonify({"error": "Location not found"}), 404
+
+    products = (Product.query.filter_by(user_id=session['user_id'], rack=rack, bin=bin)
+                .order_by(Product.id).limit(current_app.config['PRODUCTS_PAGE_MAX']).all())
+    return jsonify({
+        "rack": rack,
+        "bin": bin,
+        "product_count": location.product_count,
+        "products": products_schema.dump(products)
+    })
+
+
+# Stats #
+@bp.route('/stats', methods=['GET'])
+def get_stats():
+    # Check if logged in
+    if 'user_id' not in session:
+        return jsonify({"error": "Login required"}), 401
+
+    # Read straight from the summary tables; nothing here counts products
+    user_id = session['user_id']
+    total = db.session.get(UserCount, user_id)
+    categories = db.session.execute(
+        db.select(Category.id, Category.name, CategoryCount.product_count)
+        .join(CategoryCount, CategoryCount.category_id == Category.id)
+        .where(CategoryCount.user_id == user_id)
+        .order_by(Category.id)
+    ).all()
+    racks = db.session.execute(
+        db.select(Rack.rack, Rack.product_count).where(Rack.user_id == user_id).order_by(Rack.rack)
+    ).all()
+
+    return jsonify({
+        "product_count": total.product_count if total else 0,
+        "categories": [{"id": c.id, "name": c.name, "product_count": c.product_count} for c in categories],
+        "racks": [{"rack": r.rack, "product_count": r.product_count} for r in racks]
+    })
+
+
+# Sync #
+@bp.route('/sync', methods=['GET'])
+def sync():
+    # Check if logged in
+    if 'user_id' not in session:
+        return jsonify({"error": "Login required"}), 401
+
+    since = request.args.get('since', 0, type=int)
+    limit = request.args.get('limit', current_app.config['SYNC_PAGE_SIZE'], type=int)
+    limit = max(1, min(limit, current_app.config['SYNC_PAGE_MAX']))
+    version = InventoryVersion.current(InventoryVersion.SYNC)
+
+    def entries(*criteria, limit=None):
+        # The user's products plus the shared categories (user_id NULL), each
+        # an index range on (user_id, seq)
+        columns = (SyncEntry.entity, SyncEntry.entity_id, SyncEntry.deleted, SyncEntry.seq)
+        stmt = db.union_all(*(
+            db.select(*columns).where(owner, *criteria)
+            for owner in (SyncEntry.user_id == session['user_id'], SyncEntry.user_id.is_(None))
+        )).order_by('seq')
+        return db.session.execute(stmt if limit is None else stmt.limit(limit)).all()
+
+    # One extra row tells whether another page exists
+    rows = entries(SyncEntry.seq > since, SyncEntry.seq <= version, limit=limit + 1)
+    has_more = len(rows) > limit
+    if has_more:
+        # Entries written together share a seq; never split one across pages
+        boundary = rows[limit].seq
+        rows = [row for row in rows[:limit] if row.seq < boundary]
+        if not rows:
+            # One change bigger than a page (e.g. a bulk call) goes out whole
+            rows = entries(SyncEntry.seq == boundary)
+        version = rows[-1].seq
+
+    changed = {SyncEntry.PRODUCT: [], SyncEntry.CATEGORY: []}
+    deleted = {SyncEntry.PRODUCT: [], SyncEntry.CATEGORY: []}
+    for entity, entity_id, is_deleted, _ in rows:
+        (deleted if is_deleted else changed)[entity].append(entity_id)
+
+    products = []
+    for chunk in chunked(changed[SyncEntry.PRODUCT]):
+        products.extend(Product.query
+                        .filter(Product.id.in_(chunk))
+                        .filter_by(user_id=session['user_id']))
+    products.sort(key=lambda product: product.id)
+    categories = []
+    for chunk in chunked(changed[SyncEntry.CATEGORY]):
+        categories.extend(Category.query.filter(Category.id.in_(chunk)))
+    categories.sort(key=lambda category: category.id)
+
+    return jsonify({
+        "version": version,
+        "has_more": has_more,
+        "products": products_schema.dump(products),
+        "categories": categories_schema.dump(categories),
+        "deleted": {
+            "products": sorted(deleted[SyncEntry.PRODUCT]),
+            "categories": sorted(deleted[SyncEntry.CATEGORY])
+        }
+    })
+
+
 @bp.route('/')
 def index():
     if 'user_id' in session:
-        user = User.query.get(session['user_id'])
-        session['name'] = user.name
+        user = current_user()
+        # Only touch the session when the name actually changed, so the
+        # session isn't rewritten on every hit
+        if session.get('name') != user.name:
+            session['name'] = user.name
     return render_template_string('<h1>Hello, {{ name }}!</h1>', name=session.get('name', 'world'))
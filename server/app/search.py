@@ -0,0 +1,95 @@
+# app/search.py
+import re
+from sqlalchemy import DDL, event
+from .extensions import db
+from .models import Product
+
+# -------------------------------------------------
+# Full-text product search (SQLite FTS5)
+# -------------------------------------------------
+# products_fts mirrors every product's name, category name, rack and bin,
+# keyed by product id (rowid). Triggers on products/categories keep it in
+# sync, so ORM writes, bulk inserts and imports are all covered. Each row
+# also carries an "owner" token (u<user_id>) so per-user scoping happens
+# inside the FTS index rather than by filtering matches afterwards.
+
+SEARCH_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        name, category, rack, bin, owner,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3 4'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_insert AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts (rowid, name, category, rack, bin, owner)
+        VALUES (new.id, new.name,
+                (SELECT name FROM categories WHERE id = new.category_id),
+                coalesce(new.rack, ''), coalesce(new.bin, ''), 'u' || new.user_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_update AFTER UPDATE ON products BEGIN
+        UPDATE products_fts
+        SET name = new.name,
+            category = (SELECT name FROM categories WHERE id = new.category_id),
+            rack = coalesce(new.rack, ''),
+            bin = coalesce(new.bin, ''),
+            owner = 'u' || new.user_id
+        WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_delete AFTER DELETE ON products BEGIN
+        DELETE FROM products_fts WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_category_rename AFTER UPDATE OF name ON categories BEGIN
+        UPDATE products_fts SET category = new.name
+        WHERE rowid IN (SELECT id FROM products WHERE category_id = new.id);
+    END""",
+]
+
+for statement in SEARCH_DDL:
+    event.listen(Product.__table__, 'after_create', DDL(statement))
+event.listen(Product.__table__, 'before_drop', DDL('DROP TABLE IF EXISTS products_fts'))
+
+
+TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def optimize_search_index():
+    """Merge the FTS index segments; worth running after large bulk loads"""
+    db.session.execute(db.text("INSERT INTO products_fts (products_fts) VALUES ('optimize')"))
+    db.session.commit()
+
+
+def rebuild_search_index():
+    """Repopulate products_fts from products in one pass (after bulk loads)"""
+    db.session.execute(db.text("DELETE FROM products_fts"))
+    db.session.execute(db.text(
+        "INSERT INTO products_fts (rowid, name, category, rack, bin, owner) "
+        "SELECT products.id, products.name, categories.name, "
+        "coalesce(products.rack, ''), coalesce(products.bin, ''), 'u' || products.user_id "
+        "FROM products LEFT JOIN categories ON categories.id = products.category_id"
+    ))
+    db.session.commit()
+    optimize_search_index()
+
+
+def build_match(q, user_id):
+    """Turn free text into an FTS5 query: every word must match as a prefix"""
+    terms = TOKEN.findall(q)
+    if not terms:
+        return None
+    words = ' AND '.join(f'"{term}"*' for term in terms)
+    return f'owner:u{int(user_id)} AND {{name category rack bin}} : ({words})'
+
+
+def search_products(q, user_id, limit):
+    """Return the user's products matching ``q``, best match first"""
+    match = build_match(q, user_id)
+    if match is None:
+        return []
+    # bm25 weights per column: name, category, rack, bin, owner
+    ids = db.session.execute(db.text(
+        "SELECT rowid FROM products_fts WHERE products_fts MATCH :match "
+        "ORDER BY bm25(products_fts, 10.0, 3.0, 1.0, 1.0, 0.0) LIMIT :limit"
+    ), {"match": match, "limit": limit}).scalars().all()
+    if not ids:
+        return []
+    products = {p.id: p for p in Product.query.filter(Product.id.in_(ids))}
+    return [products[i] for i in ids if i in products]
@@ -0,0 +1,109 @@
+# app/serializers.py
+from operator import attrgetter
+from flask import current_app
+from marshmallow import fields
+from .extensions import db
+from .models import Category, Product
+from .metrics import serialization_timer
+from .models import user_schema, category_schema, categories_schema, product_schema, products_schema
+
+# -------------------------------------------------
+# Compiled dumpers
+# -------------------------------------------------
+# The marshmallow schemas dispatch through every field on every dump. The
+# fast path reads each schema's field list once at import time and turns it
+# into a single attrgetter call, so a dump is one tuple build and one dict.
+# Column values coming out of SQLite already have their JSON types, which is
+# why the Integer/String fields can be skipped without changing the output.
+
+def compile_dump(schema, methods=None):
+    """Return a function that dumps one object the way ``schema`` would."""
+    methods = methods or {}
+    plain_keys, plain_attrs, computed = [], [], []
+    for name, field in schema.dump_fields.items():
+        key = field.data_key or name
+        if isinstance(field, fields.Method):
+            computed.append((key, methods.get(name) or getattr(schema, field.serialize_method_name)))
+        else:
+            plain_keys.append(key)
+            plain_attrs.append(field.attribute or name)
+
+    getter = attrgetter(*plain_attrs)
+    if len(plain_attrs) == 1:
+        single = getter
+        getter = lambda obj: (single(obj),)
+
+    def dump(obj):
+        data = dict(zip(plain_keys, getter(obj)))
+        for key, method in computed:
+            data[key] = method(obj)
+        return data
+
+    return dump
+
+
+def user_categories_statement(user_id):
+    return (
+        db.select(Category.id, Category.name,
+                  Product.id, Product.name, Product.rack, Product.bin)
+        .join(Product, Product.category_id == Category.id)
+        .where(Product.user_id == user_id)
+        .order_by(Product.category_id, Product.id)
+    )
+
+
+def group_user_categories(rows, user_id):
+    """Nest (category, product) rows from user_categories_statement()."""
+    result = []
+    current = None
+    for cat_id, cat_name, prod_id, prod_name, rack, bin_ in rows:
+        if current is None or current["id"] != cat_id:
+            current = {"id": cat_id, "name": cat_name, "products": []}
+            result.append(current)
+        current["products"].append({
+            "id": prod_id,
+            "name": prod_name,
+            "rack": rack,
+            "bin": bin_,
+            "category_id": cat_id,
+            "user_id": user_id
+        })
+    return result
+
+
+def dump_user_categories(user):
+    """Same shape as UserSchema.get_categories, built straight from rows."""
+    rows = db.session.execute(user_categories_statement(user.id))
+    return group_user_categories(rows, user.id)
+
+
+dump_user = compile_dump(user_schema, methods={"categories": dump_user_categories})
+dump_category = compile_dump(category_schema)
+dump_product = compile_dump(product_schema)
+
+
+# -------------------------------------------------
+# Switchable serializers
+# -------------------------------------------------
+class Serializer:
+    """Dumps through the compiled path when FAST_SERIALIZERS is on, else the schema."""
+
+    def __init__(self, schema, fast_dump):
+        self.schema = schema
+        self.fast_dump = fast_dump
+        self.many = schema.many
+
+    def dump(self, obj):
+        with serialization_timer():
+            if not current_app.config.get('FAST_SERIALIZERS'):
+                return self.schema.dump(obj)
+            if self.many:
+                return [self.fast_dump(item) for item in obj]
+            return self.fast_dump(obj)
+
+
+user_serializer = Serializer(user_schema, dump_user)
+category_serializer = Serializer(category_schema, dump_category)
+categories_serializer = Serializer(categories_schema, dump_category)
+product_serializer = Serializer(product_schema, dump_product)
+products_serializer = Serializer(products_schema, dump_product)
@@ -0,0 +1,152 @@
+# app/sessions.py
+import secrets
+import threading
+import time
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+from .extensions import db
+from .models import SessionRecord
+
+# -------------------------------------------------
+# Server-side sessions
+# -------------------------------------------------
+# With SESSION_BACKEND = 'memory' or 'sqlite' the cookie only carries a signed
+# random session id and the data lives server-side. The cookie is written
+# once, when the session is created (or its id rotated at login); later
+# changes only touch the store, and requests that don't modify the session
+# don't write anything at all. 'cookie' keeps Flask's signed-cookie sessions.
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = sid is None
+        self.modified = False
+        self.loaded_user_id = self.get('user_id')
+
+
+class MemorySessionStore:
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def load(self, sid):
+        with self._lock:
+            entry = self._data.get(sid)
+            if entry is None or entry[0] < time.time():
+                return None
+            return entry[1]
+
+    def save(self, sid, data, expires_at):
+        with self._lock:
+            self._data[sid] = (expires_at, data)
+
+    def delete(self, sid):
+        with self._lock:
+            self._data.pop(sid, None)
+
+    def prune(self):
+        now = time.time()
+        with self._lock:
+            for sid in [sid for sid, (expires_at, _) in self._data.items() if expires_at < now]:
+                del self._data[sid]
+
+
+class SqliteSessionStore:
+    # Runs on its own short connection so it never joins the request's transaction
+    def load(self, sid):
+        with db.engine.connect() as conn:
+            return conn.execute(
+                db.select(SessionRecord.data)
+                .where(SessionRecord.id == sid, SessionRecord.expires_at >= time.time())
+            ).scalar()
+
+    def save(self, sid, data, expires_at):
+        with db.engine.begin() as conn:
+            conn.execute(SessionRecord.upsert_statement(sid, data, expires_at))
+
+    def delete(self, sid):
+        with db.engine.begin() as conn:
+            conn.execute(db.delete(SessionRecord).where(SessionRecord.id == sid))
+
+    def prune(self):
+        with db.engine.begin() as conn:
+            conn.execute(db.delete(SessionRecord).where(SessionRecord.expires_at < time.time()))
+
+
+class ServerSideSessionInterface(SessionInterface):
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, store):
+        self.store = store
+
+    def get_signer(self, app):
+        return Signer(app.secret_key, salt='finventory-session')
+
+    def open_session(self, app, request):
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid = self.get_signer(app).unsign(cookie).decode()
+            except BadSignature:
+                sid = None
+            data = self.store.load(sid) if sid else None
+            if data is not None:
+                return ServerSession(self.serializer.loads(data), sid=sid)
+        return ServerSession()
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.modified and session.sid:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+        if not session.modified:
+            return
+
+        # New session, or a different user logged in on this one: issue a
+        # fresh id so a planted session id can't be carried into a login
+        rotate = session.sid is None or session.get('user_id') != session.loaded_user_id
+        if rotate:
+            if session.sid:
+                self.store.delete(session.sid)
+            else:
+                self.store.prune()
+            session.sid = secrets.token_urlsafe(32)
+
+        expires_at = time.time() + app.permanent_session_lifetime.total_seconds()
+        self.store.save(session.sid, self.serializer.dumps(dict(session)), expires_at)
+
+        if rotate:
+            response.set_cookie(
+                name,
+                self.get_signer(app).sign(session.sid.encode()).decode(),
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+
+
+def init_sessions(app):
+    backend = app.config['SESSION_BACKEND']
+    if backend == 'cookie':
+        return
+    if backend == 'memory':
+        store = MemorySessionStore()
+    elif backend == 'sqlite':
+        store = SqliteSessionStore()
+    else:
+        raise ValueError(f"Unknown SESSION_BACKEND {backend!r}")
+    app.session_interface = ServerSideSessionInterface(store)
@@ -0,0 +1,74 @@
+# app/stats.py
+from sqlalchemy import DDL, event
+from .extensions import db
+
+# -------------------------------------------------
+# Inventory statistics
+# -------------------------------------------------
+# CategoryCount and UserCount are summary tables kept current by triggers on
+# products, so they change in the same transaction as the product row itself
+# (per-rack counts live in Rack, see app/locations.py). rebuild_stats()
+# recomputes every summary table from products in bulk, for existing data or
+# after writes made with the triggers missing.
+
+STATS_DDL = [
+    """CREATE TRIGGER IF NOT EXISTS stats_insert AFTER INSERT ON products BEGIN
+        INSERT INTO category_counts (user_id, category_id, product_count)
+        VALUES (new.user_id, new.category_id, 1)
+        ON CONFLICT (user_id, category_id) DO UPDATE SET product_count = product_count + 1;
+        INSERT INTO user_counts (user_id, product_count)
+        VALUES (new.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET product_count = product_count + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS stats_delete AFTER DELETE ON products BEGIN
+        UPDATE category_counts SET product_count = product_count - 1
+        WHERE user_id = old.user_id AND category_id = old.category_id;
+        DELETE FROM category_counts
+        WHERE user_id = old.user_id AND category_id = old.category_id AND product_count <= 0;
+        UPDATE user_counts SET product_count = product_count - 1
+        WHERE user_id = old.user_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS stats_move AFTER UPDATE OF category_id, user_id ON products
+    WHEN old.category_id IS NOT new.category_id OR old.user_id IS NOT new.user_id BEGIN
+        UPDATE category_counts SET product_count = product_count - 1
+        WHERE user_id = old.user_id AND category_id = old.category_id;
+        DELETE FROM category_counts
+        WHERE user_id = old.user_id AND category_id = old.category_id AND product_count <= 0;
+        INSERT INTO category_counts (user_id, category_id, product_count)
+        VALUES (new.user_id, new.category_id, 1)
+        ON CONFLICT (user_id, category_id) DO UPDATE SET product_count = product_count + 1;
+        UPDATE user_counts SET product_count = product_count - 1
+        WHERE user_id = old.user_id;
+        INSERT INTO user_counts (user_id, product_count)
+        VALUES (new.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET product_count = product_count + 1;
+    END""",
+]
+
+for statement in STATS_DDL:
+    event.listen(db.metadata, 'after_create', DDL(statement))
+
+
+REBUILD_SQL = [
+    "DELETE FROM category_counts",
+    """INSERT INTO category_counts (user_id, category_id, product_count)
+        SELECT user_id, category_id, count(*) FROM products GROUP BY user_id, category_id""",
+    "DELETE FROM user_counts",
+    """INSERT INTO user_counts (user_id, product_count)
+        SELECT user_id, count(*) FROM products GROUP BY user_id""",
+    "DELETE FROM locations",
+    """INSERT INTO locations (user_id, rack, bin, product_count)
+        SELECT user_id, rack, coalesce(bin, ''), count(*) FROM products
+        WHERE rack IS NOT NULL GROUP BY user_id, rack, coalesce(bin, '')""",
+    "DELETE FROM racks",
+    """INSERT INTO racks (user_id, rack, product_count)
+        SELECT user_id, rack, count(*) FROM products
+        WHERE rack IS NOT NULL GROUP BY user_id, rack""",
+]
+
+
+def rebuild_stats():
+    """Recompute every summary table from products in one transaction"""
+    for statement in REBUILD_SQL:
+        db.session.execute(db.text(statement))
+    db.session.commit()
@@ -0,0 +1,18 @@
+from app import create_app  # NOT from server.app
+from app.asgi import AsgiApp
+
+app = AsgiApp(create_app())
+
+if __name__ == '__main__':
+    # Production launcher; the schema must already exist (flask --app app db upgrade)
+    import uvicorn
+    config = app.flask_app.config
+    uvicorn.run(
+        'asgi:app',
+        host=config['ASGI_HOST'],
+        port=config['ASGI_PORT'],
+        workers=config['ASGI_WORKERS'],
+        timeout_keep_alive=config['ASGI_KEEP_ALIVE'],
+        lifespan='on',
+        proxy_headers=True,
+    )
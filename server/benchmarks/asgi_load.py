@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Sync vs ASGI under mixed traffic
+Seeds one database, then runs the same concurrent mix of reads (full
+check_session, categories, product pages), edits and logins against
+    - the sync app under `flask run` (threaded Werkzeug server), and
+    - server/asgi.py under uvicorn (--workers N),
+each in its own process with the production SQLite profile, and reports
+throughput and latency per server.
+
+Run from the server directory:
+    python -m benchmarks.asgi_load --concurrency 32 --requests 100 --workers 1
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from seed import generate_database
+from benchmarks.http_load import HttpClient, percentile
+
+# op -> weight in the mix
+MIX = {
+    'check_session': 20,
+    'categories': 20,
+    'products': 30,
+    'edit': 25,
+    'login': 5,
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(command, port, env):
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/check_session?shallow=1', timeout=1).read()
+            return process
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    process.kill()
+    raise SystemExit(f"server did not start: {' '.join(command)}")
+
+
+def client_loop(base_url, worker, requests, samples):
+    rng = random.Random(worker)
+    client = HttpClient(base_url)
+    login = {"name": f"user{worker:06d}", "password": "1111"}
+    client.request('POST', '/login', login)
+    _, _, body = client.request('GET', '/products?limit=50')
+    product_ids = [p['id'] for p in json.loads(body)['products']] or [None]
+
+    ops, weights = zip(*MIX.items())
+    for i in range(requests):
+        op = rng.choices(ops, weights)[0]
+        if op == 'check_session':
+            request = ('GET', '/check_session', None)
+        elif op == 'categories':
+            request = ('GET', '/categories', None)
+        elif op == 'products':
+            request = ('GET', '/products?limit=50', None)
+        elif op == 'edit' and product_ids[0] is not None:
+            product_id = rng.choice(product_ids)
+            request = ('PATCH', f'/products/{product_id}/edit',
+                       {"name": f"item {worker}-{product_id}", "rack": f"R{i % 10}", "bin": f"B{i % 7}"})
+        else:
+            op, request = 'login', ('POST', '/login', login)
+        start = time.perf_counter()
+        status, _, _ = client.request(*request)
+        samples.append((op, time.perf_counter() - start, status))
+
+
+def run_server(label, base_url, concurrency, requests):
+    samples = []
+    threads = [threading.Thread(target=client_loop, args=(base_url, worker, requests, samples))
+               for worker in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    result = {"throughput_rps": round(len(samples) / wall, 1), "ops": {}}
+    for op in ['all', *MIX]:
+        rows = [s for s in samples if op == 'all' or s[0] == op]
+        if not rows:
+            continue
+        latencies = [elapsed * 1000 for _, elapsed, _ in rows]
+        result["ops"][op] = {
+            "requests": len(rows),
+            "errors": sum(1 for _, _, status in rows if status >= 400),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+        }
+    print(f"\n{label}: {result['throughput_rps']} req/s")
+    print(f"{'op':>14} {'reqs':>6} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for op, row in result["ops"].items():
+        print(f"{op:>14} {row['requests']:>6} {row['errors']:>6} {row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9}")
+    return result
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare the sync and ASGI servers under mixed traffic")
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=100, help='requests per client (default: 100)')
+    parser.add_argument('--workers', type=int, default=1, help='uvicorn worker processes (default: 1)')
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--products', type=int, default=100_000)
+    parser.add_argument('--output', help='write results as JSON to this file')
+    return parser.parse_args()
+
+
+def run():
+    args = parse_args()
+    if args.concurrency > args.users:
+        raise SystemExit("--concurrency must not exceed --users (one user per client)")
+
+    report = {"meta": vars(args).copy(), "results": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = f"sqlite:///{os.path.join(tmp, 'asgi.db')}"
+        generate_database(args.users, 50, args.products, seed=42,
+                          chunk_size=50_000, real_hashes=False, database=uri)
+        env = dict(os.environ, FLASK_SQLALCHEMY_DATABASE_URI=uri, FLASK_SQLITE_PROFILE='production')
+
+        servers = {
+            'sync (flask run, threaded)': ['flask', '--app', 'app', 'run', '--with-threads', '--no-reload', '--no-debugger'],
+            f'asgi (uvicorn, {args.workers} worker(s))': ['uvicorn', 'asgi:app', '--workers', str(args.workers),
+                                                          '--log-level', 'warning'],
+        }
+        for label, command in servers.items():
+            port = free_port()
+            command = [sys.executable, '-m', *command, '--port', str(port)]
+            process = start_server(command, port, env)
+            try:
+                report["results"][label] = run_server(label, f'http://127.0.0.1:{port}', args.concurrency, args.requests)
+            finally:
+                process.terminate()
+                process.wait()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+HTTP load test
+Drives the main blueprint routes against a seeded database with N concurrent
+clients, in process (Flask test client) and/or through a real threaded WSGI
+server, and writes p50/p95/p99 latency, throughput and SQL statements per
+request as JSON so runs can be compared.
+
+Run from the server directory:
+    python -m benchmarks.http_load --concurrency 8 --requests 50 --output run.json
+"""
+
+import argparse
+import http.cookiejar
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from flask import g, has_request_context
+from sqlalchemy import event
+from werkzeug.serving import WSGIRequestHandler, make_server
+from app import create_app
+from app.extensions import db
+from seed import generate_database
+
+SQL_HEADER = 'X-Bench-SQL-Statements'
+
+
+# -------------------------------------------------
+# Clients
+# -------------------------------------------------
+class InProcessClient:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None):
+        response = self.client.open(path, method=method, json=body)
+        return response.status_code, response.headers, response.get_data()
+
+
+class HttpClient:
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+
+    def request(self, method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                     headers={"Content-Type": "application/json"})
+        try:
+            with self.opener.open(req) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers, e.read()
+
+
+# -------------------------------------------------
+# Scenarios
+# -------------------------------------------------
+def scenarios(worker, requests):
+    """(label, [(method, path, body)]) per route; ids filled in as products are created"""
+    created = []
+
+    def create():
+        for i in range(requests):
+            yield 'POST', '/products/new', {"name": f"bench {worker} {i} {time.time_ns()}", "category_id": 1}
+
+    def edit():
+        for product_id in created:
+            yield 'PATCH', f'/products/{product_id}/edit', {"name": f"bench {worker} edited {product_id}", "rack": "Z9"}
+
+    def delete():
+        for product_id in created:
+            yield 'DELETE', f'/products/{product_id}', None
+
+    login = {"name": f"user{worker:06d}", "password": "1111"}
+    return created, [
+        ('login', lambda: (('POST', '/login', login) for _ in range(requests))),
+        ('check_session', lambda: (('GET', '/check_session', None) for _ in range(requests))),
+        ('categories', lambda: (('GET', '/categories', None) for _ in range(requests))),
+        ('create_product', create),
+        ('update_product', edit),
+        ('delete_product', delete),
+    ]
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+def run_mode(make_client, concurrency, requests):
+    clients, plans = [], []
+    for worker in range(concurrency):
+        client = make_client()
+        client.request('POST', '/login', {"name": f"user{worker:06d}", "password": "1111"})
+        clients.append(client)
+        plans.append(scenarios(worker, requests))
+
+    results = {}
+    for step, (label, _) in enumerate(plans[0][1]):
+        samples = [[] for _ in range(concurrency)]
+
+        def drive(worker):
+            created, steps = plans[worker]
+            for method, path, body in steps[step][1]():
+                start = time.perf_counter()
+                status, headers, payload = clients[worker].request(method, path, body)
+                elapsed = time.perf_counter() - start
+                if label == 'create_product' and status == 201:
+                    created.append(json.loads(payload)['id'])
+                samples[worker].append((elapsed, status, int(headers.get(SQL_HEADER, 0))))
+
+        threads = [threading.Thread(target=drive, args=(worker,)) for worker in range(concurrency)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - start
+
+        flat = [sample for worker_samples in samples for sample in worker_samples]
+        latencies = [elapsed * 1000 for elapsed, _, _ in flat]
+        results[label] = {
+            "requests": len(flat),
+            "errors": sum(1 for _, status, _ in flat if status >= 400),
+            "throughput_rps": round(len(flat) / wall, 1) if wall else None,
+            "p50_ms": round(percentile(latencies, 50), 2) if flat else None,
+            "p95_ms": round(percentile(latencies, 95), 2) if flat else None,
+            "p99_ms": round(percentile(latencies, 99), 2) if flat else None,
+            "sql_per_request": round(sum(sql for _, _, sql in flat) / len(flat), 2) if flat else None,
+        }
+        row = results[label]
+        print(f"{label:>16} {row['requests']:>6} {row['errors']:>6} {row['throughput_rps']:>9} "
+              f"{row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9} {row['sql_per_request']:>6}")
+    return results
+
+
+# -------------------------------------------------
+# App under test
+# -------------------------------------------------
+def instrument(app):
+    """Count SQL statements per request and report them in a response header"""
+    with app.app_context():
+        engines = list(db.engines.values())
+
+    def count(*args):
+        if has_request_context():
+            g.bench_sql = g.get('bench_sql', 0) + 1
+
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', count)
+
+    @app.after_request
+    def add_sql_header(response):
+        response.headers[SQL_HEADER] = str(g.get('bench_sql', 0))
+        return response
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args):
+        pass
+
+
+def serve(app):
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test the API routes")
+    parser.add_argument('--mode', choices=['inprocess', 'wsgi', 'both'], default='both')
+    parser.add_argument('--concurrency', type=int, default=8, help='concurrent clients (default: 8)')
+    parser.add_argument('--requests', type=int, default=50, help='requests per client per route (default: 50)')
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--categories', type=int, default=50)
+    parser.add_argument('--products', type=int, default=100_000)
+    parser.add_argument('--database', help='existing database file to seed (default: a temporary file)')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    return parser.parse_args()
+
+
+def run():
+    args = parse_args()
+    if args.concurrency > args.users:
+        raise SystemExit("--concurrency must not exceed --users (one user per client)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.database or os.path.join(tmp, 'load.db')
+        uri = f"sqlite:///{os.path.abspath(path)}"
+        generate_database(args.users, args.categories, args.products, seed=42,
+                          chunk_size=50_000, real_hashes=False, database=uri)
+        app = create_app({"SQLALCHEMY_DATABASE_URI": uri})
+        instrument(app)
+
+        report = {
+            "meta": {
+                "concurrency": args.concurrency,
+                "requests_per_client": args.requests,
+                "users": args.users,
+                "categories": args.categories,
+                "products": args.products,
+                "sqlite_profile": app.config['SQLITE_PROFILE'],
+                "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            },
+            "results": {},
+        }
+        header = (f"{'route':>16} {'reqs':>6} {'errors':>6} {'req/s':>9} "
+                  f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'sql':>6}")
+
+        if args.mode in ('inprocess', 'both'):
+            print(f"\nIn process ({args.concurrency} clients)\n{header}")
+            report["results"]["inprocess"] = run_mode(lambda: InProcessClient(app), args.concurrency, args.requests)
+
+        if args.mode in ('wsgi', 'both'):
+            server = serve(app)
+            base_url = f"http://127.0.0.1:{server.server_port}"
+            print(f"\nWSGI server {base_url} ({args.concurrency} clients)\n{header}")
+            try:
+                report["results"]["wsgi"] = run_mode(lambda: HttpClient(base_url), args.concurrency, args.requests)
+            finally:
+                server.shutdown()
+
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == '__main__':
+    run()
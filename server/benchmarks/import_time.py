@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Startup import-time check
+Runs `python -X importtime -c "from app import create_app; create_app()"` in
+fresh interpreters, reports the best total and the heaviest imports under it,
+and exits non-zero when startup goes over budget or pulls in a module that is
+supposed to stay lazy. tests/test_import_time.py runs the same check (with a
+looser budget) as part of the test suite.
+
+Run from the server directory:
+    python -m benchmarks.import_time --budget-ms 750
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+STARTUP = "from app import create_app; create_app()"
+
+# Only needed by `flask db ...`, ASGI mode or optional backends
+LAZY_MODULES = ('alembic', 'flask_migrate', 'marshmallow_sqlalchemy', 'flask_bcrypt',
+                'redis', 'aiosqlite', 'asgiref', 'uvicorn')
+
+LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def measure():
+    env = dict(os.environ)
+    env.pop('FLASK_RUN_FROM_CLI', None)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', STARTUP],
+                            env=env, capture_output=True, text=True, check=True)
+    modules = {}
+    top_level, heaviest = [], []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        modules[name] = cumulative
+        if indent == 1:
+            top_level.append((cumulative, name))
+        elif indent <= 5:
+            # what create_app() pulls in, two levels down
+            heaviest.append((cumulative, name))
+    return sum(us for us, _ in top_level), sorted(heaviest, reverse=True), modules
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure create_app() import time")
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters to run (default: 5)')
+    parser.add_argument('--budget-ms', type=float, default=750, help='fail above this best-of-N total (default: 750)')
+    parser.add_argument('--top', type=int, default=10)
+    return parser.parse_args()
+
+
+def run():
+    args = parse_args()
+    runs = [measure() for _ in range(args.runs)]
+    total, heaviest, modules = min(runs, key=lambda run: run[0])
+
+    print(f"create_app() imports: best {total / 1000:.1f} ms over {args.runs} runs "
+          f"(worst {max(run[0] for run in runs) / 1000:.1f} ms)\n")
+    print(f"{'module':>28} {'cumulative ms':>14}")
+    for us, name in heaviest[:args.top]:
+        print(f"{name:>28} {us / 1000:>14.1f}")
+
+    failures = []
+    eager = [name for name in LAZY_MODULES if name in modules]
+    if eager:
+        failures.append(f"imported at startup but should be lazy: {', '.join(eager)}")
+    if total / 1000 > args.budget_ms:
+        failures.append(f"{total / 1000:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+
+    for failure in failures:
+        print(f"\nFAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Search benchmark
+FTS5-backed search_products() against a LIKE '%..%' scan of the same data
+
+Run from the server directory:  python -m benchmarks.search [products]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from app import create_app
+from app.extensions import db
+from app.models import User, Category, Product
+from app.search import search_products, optimize_search_index
+
+USERS = 100
+CHUNK = 50_000
+WORDS = ["Cordless", "Drill", "Hex", "Bolt", "Socket", "Wrench", "Pipe", "Cutter", "Safety",
+         "Vest", "Garden", "Hose", "Label", "Maker", "Wire", "Stripper", "Torque", "Grinder"]
+QUERIES = ["drill", "cordless dri", "hex bo", "wrench", "garden hose", "4207", "zzz"]
+REPEAT = 20
+
+
+def build_app(path, size):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"})
+    rng = random.Random(42)
+    with app.app_context():
+        db.create_all()
+        db.session.execute(db.insert(User), [{"name": f"user {i}", "_password_hash": "x"} for i in range(USERS)])
+        db.session.execute(db.insert(Category), [{"name": f"{word} Supplies"} for word in WORDS])
+        for start in range(0, size, CHUNK):
+            db.session.execute(db.insert(Product), [
+                {
+                    "name": f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}",
+                    "rack": f"R{i % 7}",
+                    "bin": f"B{i % 9}",
+                    "category_id": i % len(WORDS) + 1,
+                    "user_id": i % USERS + 1,
+                }
+                for i in range(start, min(start + CHUNK, size))
+            ])
+            db.session.commit()
+        optimize_search_index()
+    return app
+
+
+def like_search(q, user_id, limit):
+    query = Product.query.filter_by(user_id=user_id)
+    for term in q.split():
+        query = query.filter(Product.name.like(f'%{term}%'))
+    return query.limit(limit).all()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn(*args)
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def run(size):
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        app = build_app(os.path.join(tmp, 'search.db'), size)
+        print(f"Loaded {size} products in {time.perf_counter() - start:.1f}s\n")
+        print(f"{'query':>14} {'fts (ms)':>10} {'like (ms)':>10}")
+        with app.app_context():
+            for q in QUERIES:
+                fts = timed(search_products, q, 7, 50)
+                like = timed(like_search, q, 7, 50)
+                print(f"{q:>14} {fts:>10.2f} {like:>10.2f}")
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
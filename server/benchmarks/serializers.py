@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Serializer benchmark
+Compares the marshmallow schemas with the compiled dumpers in app/serializers.py
+
+Run from the server directory:  python -m benchmarks.serializers
+"""
+
+import time
+from app import create_app
+from app.extensions import db
+from app.models import User, Category, Product
+from app.models import user_schema, products_schema
+from app.serializers import dump_user, dump_product
+
+SIZES = [1_000, 10_000, 100_000]
+CATEGORIES = 50
+
+
+def build_app(size):
+    """In-memory database holding one user that owns ``size`` products"""
+    app = create_app({"SQLALCHEMY_DATABASE_URI": "sqlite://"})
+    with app.app_context():
+        db.create_all()
+        db.session.execute(db.insert(User), [{"name": "bench", "_password_hash": "x"}])
+        db.session.execute(db.insert(Category), [{"name": f"Category {i}"} for i in range(CATEGORIES)])
+        db.session.execute(db.insert(Product), [
+            {
+                "name": f"Product {i}",
+                "rack": f"R{i % 7}",
+                "bin": f"B{i % 9}" if i % 5 else None,
+                "category_id": i % CATEGORIES + 1,
+                "user_id": 1,
+            }
+            for i in range(size)
+        ])
+        db.session.commit()
+    return app
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run():
+    print(f"{'products':>10} {'payload':>10} {'schema (s)':>12} {'compiled (s)':>13} {'speedup':>8}")
+    for size in SIZES:
+        app = build_app(size)
+        with app.app_context():
+            user = db.session.get(User, 1)
+            products = Product.query.all()
+
+            cases = [
+                ("user", lambda: user_schema.dump(user), lambda: dump_user(user)),
+                ("products", lambda: products_schema.dump(products), lambda: [dump_product(p) for p in products]),
+            ]
+            for label, slow, fast in cases:
+                slow_out, slow_time = timed(slow)
+                fast_out, fast_time = timed(fast)
+                if app.json.dumps(slow_out) != app.json.dumps(fast_out):
+                    raise SystemExit(f"{label} output differs at {size} products")
+                print(f"{size:>10} {label:>10} {slow_time:>12.4f} {fast_time:>13.4f} {slow_time / fast_time:>7.1f}x")
+            db.session.remove()
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Snapshot format benchmark
+Compares the nested user tree (compiled dumper) with the columnar snapshot in
+app/columnar.py: time to build and encode, payload size raw / gzip / brotli,
+time to compress, and time for the client-side JSON parse.
+
+Run from the server directory:  python -m benchmarks.snapshot_formats
+"""
+
+import gzip
+import json
+import time
+from app.extensions import db
+from app.models import User
+from app.serializers import dump_user
+from app.columnar import dump_user_columnar
+from app.compression import brotli
+from benchmarks.serializers import SIZES, build_app, timed
+
+
+def run():
+    print(f"{'products':>10} {'format':>9} {'encode s':>9} {'raw KB':>9} {'gzip KB':>9} {'gzip s':>8} "
+          f"{'br KB':>8} {'br s':>7} {'parse s':>8}")
+    for size in SIZES:
+        app = build_app(size)
+        with app.app_context():
+            user = db.session.get(User, 1)
+            cases = [("nested", lambda: dump_user(user)), ("columnar", lambda: dump_user_columnar(user))]
+            for label, build in cases:
+                body, encode_time = timed(lambda: app.json.dumps(build()).encode())
+                gzipped, gzip_time = timed(lambda: gzip.compress(body, compresslevel=app.config['COMPRESS_GZIP_LEVEL']))
+                if brotli is not None:
+                    brotlied, brotli_time = timed(lambda: brotli.compress(body, quality=app.config['COMPRESS_BROTLI_QUALITY']))
+                    br_kb, br_s = f"{len(brotlied) / 1024:>8.1f}", f"{brotli_time:>7.3f}"
+                else:
+                    br_kb, br_s = f"{'-':>8}", f"{'-':>7}"
+                _, parse_time = timed(lambda: json.loads(body))
+                print(f"{size:>10} {label:>9} {encode_time:>9.4f} {len(body) / 1024:>9.1f} "
+                      f"{len(gzipped) / 1024:>9.1f} {gzip_time:>8.3f} {br_kb} {br_s} {parse_time:>8.4f}")
+            db.session.remove()
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+SQLite concurrency benchmark
+Read throughput while writes are happening, for each engine profile in config.py
+
+Run from the server directory:  python -m benchmarks.sqlite_concurrency
+"""
+
+import os
+import random
+import tempfile
+import threading
+import time
+from app import create_app
+from app.extensions import db
+from app.models import User, Category, Product
+
+PRODUCTS = 5_000
+READERS = 8
+WRITERS = 2
+DURATION = 5.0
+
+
+def build_app(profile, path):
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}",
+        "SQLITE_PROFILE": profile,
+        "HASH_WORKERS": 0,
+        "BCRYPT_LOG_ROUNDS": 4,
+    })
+    with app.app_context():
+        db.create_all()
+        user = User(name="bench")
+        user.password_hash = "bench"
+        db.session.add(user)
+        db.session.execute(db.insert(Category), [{"name": f"Category {i}"} for i in range(20)])
+        db.session.flush()
+        db.session.execute(db.insert(Product), [
+            {"name": f"Product {i}", "rack": f"R{i % 7}", "bin": f"B{i % 9}",
+             "category_id": i % 20 + 1, "user_id": user.id}
+            for i in range(PRODUCTS)
+        ])
+        db.session.commit()
+    return app
+
+
+def worker(app, action, stop, counts):
+    client = app.test_client()
+    client.post('/login', json={"name": "bench", "password": "bench"})
+    ok = errors = 0
+    while not stop.is_set():
+        try:
+            response = action(client)
+            if response.status_code < 400:
+                ok += 1
+            else:
+                errors += 1
+        except Exception:
+            errors += 1
+    counts.append((ok, errors))
+
+
+def read(client):
+    return client.get(f'/products?limit=50&category_id={random.randint(1, 20)}')
+
+
+def write(client):
+    product_id = random.randint(1, PRODUCTS)
+    return client.patch(f'/products/{product_id}/edit', json={
+        "name": f"Product {product_id - 1}",
+        "rack": f"R{random.randint(0, 6)}",
+    })
+
+
+def run_profile(profile):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = build_app(profile, os.path.join(tmp, 'bench.db'))
+        stop = threading.Event()
+        reads, writes = [], []
+        threads = [threading.Thread(target=worker, args=(app, read, stop, reads)) for _ in range(READERS)]
+        threads += [threading.Thread(target=worker, args=(app, write, stop, writes)) for _ in range(WRITERS)]
+        for thread in threads:
+            thread.start()
+        time.sleep(DURATION)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose()
+
+    read_ok, read_err = map(sum, zip(*reads))
+    write_ok, write_err = map(sum, zip(*writes))
+    print(f"{profile:>12} {read_ok / DURATION:>10.0f} {write_ok / DURATION:>10.0f} {read_err:>8} {write_err:>8}")
+
+
+def run():
+    print(f"{READERS} readers, {WRITERS} writers, {DURATION:.0f}s per profile, {PRODUCTS} products")
+    print(f"{'profile':>12} {'reads/s':>10} {'writes/s':>10} {'r errs':>8} {'w errs':>8}")
+    for profile in create_app().config['SQLITE_PROFILES']:
+        run_profile(profile)
+
+
+if __name__ == '__main__':
+    run()
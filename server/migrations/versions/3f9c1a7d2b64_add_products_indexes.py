@@ -0,0 +1,36 @@
+"""add products indexes
+
+Revision ID: 3f9c1a7d2b64
+Revises: 
+Create Date: 2026-10-18 12:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c1a7d2b64'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_products_user_id', ['user_id']),
+    ('ix_products_user_id_category_id', ['user_id', 'category_id']),
+    ('ix_products_user_id_rack_bin', ['user_id', 'rack', 'bin']),
+    ('ix_products_user_id_name', ['user_id', 'name']),
+    ('ix_products_category_id', ['category_id']),
+]
+
+
+def upgrade():
+    # Databases created by db.create_all() after this change already have them
+    for name, columns in INDEXES:
+        op.create_index(name, 'products', columns, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='products', if_exists=True)
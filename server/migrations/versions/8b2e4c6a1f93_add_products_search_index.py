@@ -0,0 +1,61 @@
+"""add products full-text search index
+
+Revision ID: 8b2e4c6a1f93
+Revises: 3f9c1a7d2b64
+Create Date: 2026-10-18 13:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4c6a1f93'
+down_revision = '3f9c1a7d2b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        name, category, rack, bin, owner,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3 4'
+    )""")
+    op.execute("""CREATE TRIGGER IF NOT EXISTS products_fts_insert AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts (rowid, name, category, rack, bin, owner)
+        VALUES (new.id, new.name,
+                (SELECT name FROM categories WHERE id = new.category_id),
+                coalesce(new.rack, ''), coalesce(new.bin, ''), 'u' || new.user_id);
+    END""")
+    op.execute("""CREATE TRIGGER IF NOT EXISTS products_fts_update AFTER UPDATE ON products BEGIN
+        UPDATE products_fts
+        SET name = new.name,
+            category = (SELECT name FROM categories WHERE id = new.category_id),
+            rack = coalesce(new.rack, ''),
+            bin = coalesce(new.bin, ''),
+            owner = 'u' || new.user_id
+        WHERE rowid = old.id;
+    END""")
+    op.execute("""CREATE TRIGGER IF NOT EXISTS products_fts_delete AFTER DELETE ON products BEGIN
+        DELETE FROM products_fts WHERE rowid = old.id;
+    END""")
+    op.execute("""CREATE TRIGGER IF NOT EXISTS products_fts_category_rename AFTER UPDATE OF name ON categories BEGIN
+        UPDATE products_fts SET category = new.name
+        WHERE rowid IN (SELECT id FROM products WHERE category_id = new.id);
+    END""")
+
+    # Backfill existing products
+    op.execute("DELETE FROM products_fts")
+    op.execute("""INSERT INTO products_fts (rowid, name, category, rack, bin, owner)
+        SELECT products.id, products.name, categories.name,
+               coalesce(products.rack, ''), coalesce(products.bin, ''), 'u' || products.user_id
+        FROM products LEFT JOIN categories ON categories.id = products.category_id""")
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS products_fts_category_rename")
+    op.execute("DROP TRIGGER IF EXISTS products_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS products_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS products_fts_insert")
+    op.execute("DROP TABLE IF EXISTS products_fts")
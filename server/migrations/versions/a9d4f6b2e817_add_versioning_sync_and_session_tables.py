@@ -0,0 +1,54 @@
+"""add inventory versions, sync entries and server-side session tables
+
+These used to be created by the db.create_all() call in run.py, which no
+migration covered; databases upgraded with `flask db upgrade` need them.
+
+Revision ID: a9d4f6b2e817
+Revises: e5a3b8d1c7f2
+Create Date: 2026-10-18 16:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d4f6b2e817'
+down_revision = 'e5a3b8d1c7f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('inventory_versions',
+        sa.Column('key', sa.String(length=40), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+        if_not_exists=True
+    )
+    op.create_table('sync_entries',
+        sa.Column('entity', sa.String(length=10), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('seq', sa.Integer(), nullable=False),
+        sa.Column('deleted', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('entity', 'entity_id'),
+        if_not_exists=True
+    )
+    op.create_index('ix_sync_entries_seq', 'sync_entries', ['seq'], unique=False, if_not_exists=True)
+    op.create_table('sessions',
+        sa.Column('id', sa.String(length=64), nullable=False),
+        sa.Column('data', sa.Text(), nullable=False),
+        sa.Column('expires_at', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_index('ix_sessions_expires_at', 'sessions', ['expires_at'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_sessions_expires_at', table_name='sessions', if_exists=True)
+    op.drop_table('sessions', if_exists=True)
+    op.drop_index('ix_sync_entries_seq', table_name='sync_entries', if_exists=True)
+    op.drop_table('sync_entries', if_exists=True)
+    op.drop_table('inventory_versions', if_exists=True)
@@ -0,0 +1,94 @@
+"""add rack/bin location index
+
+Revision ID: c47d9e2f5a18
+Revises: 8b2e4c6a1f93
+Create Date: 2026-10-18 13:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47d9e2f5a18'
+down_revision = '8b2e4c6a1f93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('locations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('rack', sa.String(length=80), nullable=False),
+        sa.Column('bin', sa.String(length=80), nullable=False),
+        sa.Column('product_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'rack', 'bin'),
+        if_not_exists=True
+    )
+    op.create_table('racks',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('rack', sa.String(length=80), nullable=False),
+        sa.Column('product_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'rack'),
+        if_not_exists=True
+    )
+
+    op.execute("""CREATE TRIGGER IF NOT EXISTS locations_insert AFTER INSERT ON products
+    WHEN new.rack IS NOT NULL BEGIN
+        INSERT INTO locations (user_id, rack, bin, product_count)
+        VALUES (new.user_id, new.rack, coalesce(new.bin, ''), 1)
+        ON CONFLICT (user_id, rack, bin) DO UPDATE SET product_count = product_count + 1;
+        INSERT INTO racks (user_id, rack, product_count)
+        VALUES (new.user_id, new.rack, 1)
+        ON CONFLICT (user_id, rack) DO UPDATE SET product_count = product_count + 1;
+    END""")
+    op.execute("""CREATE TRIGGER IF NOT EXISTS locations_delete AFTER DELETE ON products
+    WHEN old.rack IS NOT NULL BEGIN
+        UPDATE locations SET product_count = product_count - 1
+        WHERE user_id = old.user_id AND rack = old.rack AND bin = coalesce(old.bin, '');
+        DELETE FROM locations
+        WHERE user_id = old.user_id AND rack = old.rack AND bin = coalesce(old.bin, '') AND product_count <= 0;
+        UPDATE racks SET product_count = product_count - 1
+        WHERE user_id = old.user_id AND rack = old.rack;
+        DELETE FROM racks
+        WHERE user_id = old.user_id AND rack = old.rack AND product_count <= 0;
+    END""")
+    op.execute("""CREATE TRIGGER IF NOT EXISTS locations_move AFTER UPDATE OF rack, bin, user_id ON products
+    WHEN old.rack IS NOT new.rack OR old.bin IS NOT new.bin OR old.user_id IS NOT new.user_id BEGIN
+        UPDATE locations SET product_count = product_count - 1
+        WHERE user_id = old.user_id AND rack = old.rack AND bin = coalesce(old.bin, '');
+        DELETE FROM locations
+        WHERE user_id = old.user_id AND rack = old.rack AND bin = coalesce(old.bin, '') AND product_count <= 0;
+        UPDATE racks SET product_count = product_count - 1
+        WHERE user_id = old.user_id AND rack = old.rack;
+        DELETE FROM racks
+        WHERE user_id = old.user_id AND rack = old.rack AND product_count <= 0;
+        INSERT INTO locations (user_id, rack, bin, product_count)
+        SELECT new.user_id, new.rack, coalesce(new.bin, ''), 1 WHERE new.rack IS NOT NULL
+        ON CONFLICT (user_id, rack, bin) DO UPDATE SET product_count = product_count + 1;
+        INSERT INTO racks (user_id, rack, product_count)
+        SELECT new.user_id, new.rack, 1 WHERE new.rack IS NOT NULL
+        ON CONFLICT (user_id, rack) DO UPDATE SET product_count = product_count + 1;
+    END""")
+
+    # Backfill counts for existing products
+    op.execute("DELETE FROM locations")
+    op.execute("DELETE FROM racks")
+    op.execute("""INSERT INTO locations (user_id, rack, bin, product_count)
+        SELECT user_id, rack, coalesce(bin, ''), count(*) FROM products
+        WHERE rack IS NOT NULL GROUP BY user_id, rack, coalesce(bin, '')""")
+    op.execute("""INSERT INTO racks (user_id, rack, product_count)
+        SELECT user_id, rack, count(*) FROM products
+        WHERE rack IS NOT NULL GROUP BY user_id, rack""")
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS locations_move")
+    op.execute("DROP TRIGGER IF EXISTS locations_delete")
+    op.execute("DROP TRIGGER IF EXISTS locations_insert")
+    op.drop_table('racks')
+    op.drop_table('locations')
@@ -0,0 +1,40 @@
+"""backfill sync entries and index them by user
+
+Products and categories that existed before the sync log was added have no
+sync_entries row, so GET /sync?since=0 left them out. They are recorded here
+at one new sync sequence.
+
+Revision ID: d2f7a91c4b35
+Revises: a9d4f6b2e817
+Create Date: 2026-10-18 19:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f7a91c4b35'
+down_revision = 'a9d4f6b2e817'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_sync_entries_user_id_seq', 'sync_entries', ['user_id', 'seq'], unique=False, if_not_exists=True)
+
+    op.execute("""INSERT INTO inventory_versions (key, version) VALUES ('sync', 1)
+        ON CONFLICT (key) DO UPDATE SET version = version + 1""")
+    op.execute("""INSERT INTO sync_entries (entity, entity_id, user_id, seq, deleted)
+        SELECT 'product', id, user_id, (SELECT version FROM inventory_versions WHERE key = 'sync'), 0
+        FROM products
+        WHERE id NOT IN (SELECT entity_id FROM sync_entries WHERE entity = 'product')""")
+    op.execute("""INSERT INTO sync_entries (entity, entity_id, user_id, seq, deleted)
+        SELECT 'category', id, NULL, (SELECT version FROM inventory_versions WHERE key = 'sync'), 0
+        FROM categories
+        WHERE id NOT IN (SELECT entity_id FROM sync_entries WHERE entity = 'category')""")
+
+
+def downgrade():
+    # The backfilled entries are ordinary sync records and stay
+    op.drop_index('ix_sync_entries_user_id_seq', table_name='sync_entries', if_exists=True)
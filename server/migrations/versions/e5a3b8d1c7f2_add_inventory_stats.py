@@ -0,0 +1,83 @@
+"""add inventory statistics summary tables
+
+Revision ID: e5a3b8d1c7f2
+Revises: c47d9e2f5a18
+Create Date: 2026-10-18 14:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a3b8d1c7f2'
+down_revision = 'c47d9e2f5a18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('category_counts',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('product_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'category_id'),
+        if_not_exists=True
+    )
+    op.create_table('user_counts',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('product_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id'),
+        if_not_exists=True
+    )
+
+    op.execute("""CREATE TRIGGER IF NOT EXISTS stats_insert AFTER INSERT ON products BEGIN
+        INSERT INTO category_counts (user_id, category_id, product_count)
+        VALUES (new.user_id, new.category_id, 1)
+        ON CONFLICT (user_id, category_id) DO UPDATE SET product_count = product_count + 1;
+        INSERT INTO user_counts (user_id, product_count)
+        VALUES (new.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET product_count = product_count + 1;
+    END""")
+    op.execute("""CREATE TRIGGER IF NOT EXISTS stats_delete AFTER DELETE ON products BEGIN
+        UPDATE category_counts SET product_count = product_count - 1
+        WHERE user_id = old.user_id AND category_id = old.category_id;
+        DELETE FROM category_counts
+        WHERE user_id = old.user_id AND category_id = old.category_id AND product_count <= 0;
+        UPDATE user_counts SET product_count = product_count - 1
+        WHERE user_id = old.user_id;
+    END""")
+    op.execute("""CREATE TRIGGER IF NOT EXISTS stats_move AFTER UPDATE OF category_id, user_id ON products
+    WHEN old.category_id IS NOT new.category_id OR old.user_id IS NOT new.user_id BEGIN
+        UPDATE category_counts SET product_count = product_count - 1
+        WHERE user_id = old.user_id AND category_id = old.category_id;
+        DELETE FROM category_counts
+        WHERE user_id = old.user_id AND category_id = old.category_id AND product_count <= 0;
+        INSERT INTO category_counts (user_id, category_id, product_count)
+        VALUES (new.user_id, new.category_id, 1)
+        ON CONFLICT (user_id, category_id) DO UPDATE SET product_count = product_count + 1;
+        UPDATE user_counts SET product_count = product_count - 1
+        WHERE user_id = old.user_id;
+        INSERT INTO user_counts (user_id, product_count)
+        VALUES (new.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET product_count = product_count + 1;
+    END""")
+
+    # Backfill counts for existing products
+    op.execute("DELETE FROM category_counts")
+    op.execute("""INSERT INTO category_counts (user_id, category_id, product_count)
+        SELECT user_id, category_id, count(*) FROM products GROUP BY user_id, category_id""")
+    op.execute("DELETE FROM user_counts")
+    op.execute("""INSERT INTO user_counts (user_id, product_count)
+        SELECT user_id, count(*) FROM products GROUP BY user_id""")
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS stats_move")
+    op.execute("DROP TRIGGER IF EXISTS stats_delete")
+    op.execute("DROP TRIGGER IF EXISTS stats_insert")
+    op.drop_table('user_counts')
+    op.drop_table('category_counts')
@@ -0,0 +1,30 @@
+"""store blank product racks and bins as NULL
+
+A product saved with rack or bin '' was counted at a location no
+/locations URL could reach. Blank values are written as NULL now; the
+locations triggers move the existing ones' counts as they are cleared.
+
+Revision ID: f1c8e4a6b953
+Revises: d2f7a91c4b35
+Create Date: 2026-10-18 21:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c8e4a6b953'
+down_revision = 'd2f7a91c4b35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("UPDATE products SET rack = NULL WHERE rack = ''")
+    op.execute("UPDATE products SET bin = NULL WHERE bin = ''")
+
+
+def downgrade():
+    # NULL and '' meant the same location; nothing to restore
+    pass
@@ -1,10 +1,8 @@
 from app import create_app  # NOT from server.app
-from app.extensions import db
 
+# The schema is no longer created on every boot; run `flask --app app init-db`
+# once for a fresh database (or `flask --app app db upgrade` for an existing one)
 app = create_app()
 
-with app.app_context():
-    db.create_all()
-
 if __name__ == '__main__':
-    app.run(port=5555, debug=True)
\ No newline at end of file
+    app.run(port=5555, debug=True)
@@ -2,12 +2,23 @@
 """
 Seed file for the Inventory Management System
 Run this file to populate the database with sample data
+
+    python seed.py                      # the small sample dataset below
+    python seed.py --users 1000 --categories 500 --products 5_000_000 --seed 42
+
+With --users/--categories/--products it generates a deterministic dataset of
+that size for load testing instead (see generate_database).
 """
 
+import argparse
 import random
+import time
 from app import create_app
 from app.extensions import db
-from app.models import User, Category, Product
+from app.models import User, Category, Product, SyncEntry
+from app.hashing import hash_password
+from app.search import rebuild_search_index
+from app.stats import rebuild_stats
 
 def seed_database():
     """Populate the database with sample data"""
@@ -105,6 +116,11 @@ def seed_database():
         
         db.session.commit()
         print(f"✓ Created {len(products)} products")
+
+        # The rows above went in without sync records; log them so
+        # GET /sync?since=0 returns the whole inventory
+        SyncEntry.backfill()
+        db.session.commit()
         
         # Print summary
         josh_count = Product.query.filter_by(user_id=josh.id).count()
@@ -123,5 +139,116 @@ def seed_database():
         print(f"\nTotal: {Product.query.count()} products")
         print("="*60)
 
+# -------------------------------------------------
+# Load-test dataset generator
+# -------------------------------------------------
+NOUNS = ["Drill", "Wrench", "Hammer", "Socket", "Bolt", "Screw", "Pipe", "Cable", "Hose",
+         "Glove", "Vest", "Filter", "Clamp", "Saw", "Level", "Tape", "Label", "Meter"]
+ADJECTIVES = ["Cordless", "Heavy", "Mini", "Steel", "Brass", "Digital", "Safety", "Garden",
+              "Torque", "Impact", "Quick", "Flex", "Pro", "Compact", "Metric", "Standard"]
+LETTERS = "ABCDEFG"
+
+
+def timed_insert(label, table, rows, total, chunk_size):
+    """Insert rows from a generator with core executemany, committing per chunk"""
+    start = time.perf_counter()
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            db.session.execute(db.insert(table), chunk)
+            db.session.commit()
+            chunk.clear()
+    if chunk:
+        db.session.execute(db.insert(table), chunk)
+        db.session.commit()
+    elapsed = time.perf_counter() - start
+    print(f"✓ Created {total} {label} in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+
+
+def drop_triggers():
+    """Drop the summary/search triggers for the bulk load; returns their SQL"""
+    triggers = db.session.execute(db.text(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger'"
+    )).all()
+    for name, _ in triggers:
+        db.session.execute(db.text(f'DROP TRIGGER "{name}"'))
+    db.session.commit()
+    return [sql for _, sql in triggers]
+
+
+def generate_database(users, categories, products, seed, chunk_size, real_hashes, database=None):
+    """Populate the database with a deterministic dataset of the given size"""
+    config = {"SQLALCHEMY_DATABASE_URI": database} if database else None
+    app = create_app(config)
+    rng = random.Random(seed)
+
+    with app.app_context():
+        print("Clearing existing data...")
+        db.drop_all()
+        db.create_all()
+        # Rows are loaded with the triggers off; the search index and summary
+        # tables are then rebuilt in one pass each
+        triggers = drop_triggers()
+
+        # Every user gets password '1111'. Unless --real-hashes is given, one
+        # bcrypt hash is computed up front and shared, instead of one per user.
+        shared_hash = None if real_hashes else hash_password("1111", app.config['BCRYPT_LOG_ROUNDS'])
+        timed_insert("users", User.__table__, (
+            {"name": f"user{i:06d}", "_password_hash": shared_hash or hash_password("1111", app.config['BCRYPT_LOG_ROUNDS'])}
+            for i in range(users)
+        ), users, chunk_size)
+
+        timed_insert("categories", Category.__table__, (
+            {"name": f"{ADJECTIVES[i % len(ADJECTIVES)]} {NOUNS[i % len(NOUNS)]}s {i}"}
+            for i in range(categories)
+        ), categories, chunk_size)
+
+        timed_insert("products", Product.__table__, (
+            {
+                "name": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i}",
+                "rack": f"{rng.choice(LETTERS)}{rng.randint(1, 9)}",
+                "bin": f"{rng.choice(LETTERS)}{rng.randint(1, 9)}",
+                "category_id": rng.randint(1, categories),
+                "user_id": rng.randint(1, users),
+            }
+            for i in range(products)
+        ), products, chunk_size)
+
+        start = time.perf_counter()
+        for sql in triggers:
+            db.session.execute(db.text(sql))
+        SyncEntry.backfill()
+        db.session.commit()
+        rebuild_stats()
+        rebuild_search_index()
+        print(f"✓ Rebuilt search index, statistics and sync log in {time.perf_counter() - start:.1f}s")
+        print(f"\nTotal: {users} users, {categories} categories, {products} products (password for all: '1111')")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, help='generate this many users')
+    parser.add_argument('--categories', type=int, help='generate this many categories')
+    parser.add_argument('--products', type=int, help='generate this many products')
+    parser.add_argument('--seed', type=int, default=42, help='random seed (default: 42)')
+    parser.add_argument('--chunk-size', type=int, default=50_000, help='rows per commit (default: 50000)')
+    parser.add_argument('--real-hashes', action='store_true', help='bcrypt every user password separately')
+    parser.add_argument('--database', help='SQLAlchemy URI to seed instead of the configured one')
+    return parser.parse_args()
+
+
 if __name__ == '__main__':
-    seed_database()
\ No newline at end of file
+    args = parse_args()
+    if args.users or args.categories or args.products:
+        generate_database(
+            users=args.users or 2,
+            categories=args.categories or 10,
+            products=args.products or 0,
+            seed=args.seed,
+            chunk_size=args.chunk_size,
+            real_hashes=args.real_hashes,
+            database=args.database,
+        )
+    else:
+        seed_database()
\ No newline at end of file
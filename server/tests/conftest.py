@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models import User, Category, Product
+
+
+@pytest.fixture
+def app():
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite://",
+        "HASH_WORKERS": 0,
+        "BCRYPT_LOG_ROUNDS": 4,
+    })
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def user(app):
+    """A user with products spread over several categories"""
+    user = User(name="ann", password_hash="1111")
+    categories = [Category(name=f"cat{i}") for i in range(5)]
+    db.session.add(user)
+    db.session.add_all(categories)
+    db.session.flush()
+    db.session.add_all(
+        Product(name=f"prod{i}", rack=f"R{i % 3}", bin=f"B{i % 7}",
+                category_id=categories[i % len(categories)].id, user_id=user.id)
+        for i in range(50)
+    )
+    db.session.commit()
+    db.session.expire_all()
+    return user
+
+
+@pytest.fixture
+def client(app, user):
+    """Test client logged in as ``user``"""
+    client = app.test_client()
+    response = client.post('/login', json={"name": "ann", "password": "1111"})
+    assert response.status_code == 200
+    return client
+
+
+@pytest.fixture
+def count_statements(app):
+    """Context manager counting the SQL statements run inside it"""
+    class Counter:
+        def __init__(self):
+            self.statements = []
+
+        def __enter__(self):
+            event.listen(db.engine, 'before_cursor_execute', self.record)
+            return self
+
+        def __exit__(self, *exc):
+            event.remove(db.engine, 'before_cursor_execute', self.record)
+
+        def record(self, conn, cursor, statement, parameters, context, executemany):
+            self.statements.append(statement)
+
+    return Counter
@@ -0,0 +1,53 @@
+import pytest
+from app import create_app
+from app.extensions import db
+from app.models import Product
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'batching.db'}",
+        "HASH_WORKERS": 0,
+        "BCRYPT_LOG_ROUNDS": 4,
+        "WRITE_BATCHING": True,
+    })
+    with app.app_context():
+        db.create_all()
+        yield app
+        app.extensions['edit_batcher'].stop()
+        db.session.remove()
+
+
+def product_id(name):
+    return Product.query.filter_by(name=name).one().id
+
+
+def test_queued_edit_is_acknowledged_then_committed(app, client):
+    id = product_id("prod0")
+
+    queued = client.patch(f'/products/{id}/edit', json={"name": "prod0", "rack": "Q1"})
+    durable = client.patch(f'/products/{id}/edit?durable=1', json={"name": "prod0", "bin": "Q2"})
+
+    assert queued.status_code == 202
+    assert queued.get_json()["rack"] == "Q1"
+    assert durable.status_code == 200
+    assert (durable.get_json()["rack"], durable.get_json()["bin"]) == ("Q1", "Q2")
+    db.session.expire_all()
+    product = db.session.get(Product, id)
+    assert (product.rack, product.bin) == ("Q1", "Q2")
+
+
+def test_name_clashes_are_rejected_before_queueing(app, client):
+    first, second = product_id("prod1"), product_id("prod2")
+
+    taken = client.patch(f'/products/{first}/edit', json={"name": "prod2"})
+    assert taken.status_code == 409
+    assert taken.get_json() == {"error": "Product name already exists"}
+
+    # A name claimed by a queued edit is taken whether or not its batch has committed
+    assert client.patch(f'/products/{first}/edit', json={"name": "renamed"}).status_code == 202
+    queued = client.patch(f'/products/{second}/edit', json={"name": "renamed"})
+    assert queued.status_code == 409
+    assert queued.get_json() == {"error": "Product name already exists"}
@@ -0,0 +1,73 @@
+from app.extensions import db
+from app.models import Category, Product
+
+
+def first_category_id():
+    return Category.query.filter_by(name="cat0").one().id
+
+
+def test_bulk_applies_valid_items_in_one_call(client, user):
+    category_id = first_category_id()
+    existing = Product.query.filter_by(name="prod0").one()
+    doomed = Product.query.filter_by(name="prod1").one()
+
+    response = client.post('/products/bulk', json={
+        "upserts": [
+            {"name": "new-a", "category_id": category_id, "rack": "Z9"},
+            {"id": existing.id, "name": "prod0-renamed"},
+        ],
+        "deletes": [doomed.id],
+    })
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [row["name"] for row in body["created"]] == ["new-a"]
+    assert body["updated"] == [existing.id]
+    assert body["deleted"] == [doomed.id]
+    assert body["errors"] == []
+    assert Product.query.filter_by(name="prod0-renamed").count() == 1
+    assert db.session.get(Product, doomed.id) is None
+
+
+def test_bulk_reports_malformed_items_per_index(client, user):
+    category_id = first_category_id()
+
+    response = client.post('/products/bulk', json={
+        "upserts": [
+            {"name": ["list"], "category_id": category_id},
+            {"id": {"a": 1}, "name": "x"},
+            {"name": "y", "category_id": [category_id]},
+            {"name": "z", "category_id": category_id, "bin": {"b": 1}},
+            {"name": "prod2", "category_id": category_id},
+            {"name": "w", "category_id": 9999},
+            {"id": 999999, "name": "v"},
+            "not an object",
+            {"name": "ok", "category_id": category_id},
+        ],
+        "deletes": [[1], {"id": 1}, True, 999999],
+    })
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [row["name"] for row in body["created"]] == ["ok"]
+    assert body["errors"] == [
+        {"index": 0, "op": "upsert", "error": "name is required"},
+        {"index": 1, "op": "upsert", "error": "id must be an integer"},
+        {"index": 2, "op": "upsert", "error": "category_id must be an integer"},
+        {"index": 3, "op": "upsert", "error": "rack and bin must be strings"},
+        {"index": 4, "op": "upsert", "error": "Product name already exists"},
+        {"index": 5, "op": "upsert", "error": "Category not found"},
+        {"index": 6, "op": "upsert", "error": "Product not found"},
+        {"index": 7, "op": "upsert", "error": "name is required"},
+        {"index": 0, "op": "delete", "error": "id must be an integer"},
+        {"index": 1, "op": "delete", "error": "id must be an integer"},
+        {"index": 2, "op": "delete", "error": "id must be an integer"},
+        {"index": 3, "op": "delete", "error": "Product not found"},
+    ]
+
+
+def test_bulk_rejects_a_body_without_lists(client):
+    response = client.post('/products/bulk', json={"upserts": {"name": "x"}})
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "upserts and/or deletes lists required"}
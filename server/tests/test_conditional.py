@@ -0,0 +1,40 @@
+import pytest
+from app.models import Product
+
+
+@pytest.mark.parametrize('path', ['/profile', '/check_session', '/categories'])
+def test_matching_etag_gets_304(client, path):
+    first = client.get(path)
+    assert first.status_code == 200
+    assert first.get_json()
+    etag = first.headers['ETag']
+
+    again = client.get(path, headers={"If-None-Match": etag})
+
+    assert again.status_code == 304
+    assert again.get_data() == b''
+    assert again.headers['ETag'] == etag
+
+
+def test_product_edit_changes_the_user_etag(client, user):
+    etag = client.get('/profile').headers['ETag']
+    product = Product.query.filter_by(name="prod0").first()
+
+    assert client.patch(f'/products/{product.id}/edit', json={"name": "prod0-renamed"}).status_code == 200
+    response = client.get('/profile', headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    names = [p["name"] for c in response.get_json()["categories"] for p in c["products"]]
+    assert "prod0-renamed" in names
+
+
+def test_new_category_changes_the_catalog_etag(client):
+    etag = client.get('/categories').headers['ETag']
+
+    assert client.post('/categories/new', json={"name": "fresh"}).status_code == 201
+    response = client.get('/categories', headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert "fresh" in [c["name"] for c in response.get_json()]
@@ -0,0 +1,73 @@
+from app.models import Product
+
+NDJSON = b"\n".join([
+    b'{"name": "drill", "category": "cat0", "rack": "A1"}',
+    b'{"name": "saw", "category": "cat1"',
+    b'',
+    b'[1, 2]',
+    b'{"name": "bolt\xff", "category": "cat0"}',
+    b'{"name": "prod0", "category": "cat0"}',
+    b'{"name": "nut", "category": "cat0", "bin": {"b": 1}}',
+    b'{"name": "drill", "category": "cat1"}',
+    b'{"name": "washer", "category_id": 9999}',
+    b'{"name": "screw", "category": "cat2", "bin": "B1"}',
+])
+
+
+def import_file(client, body, fmt, **params):
+    query = "&".join(f"{key}={value}" for key, value in params.items())
+    return client.post(f'/products/import?format={fmt}&{query}', data=body)
+
+
+def test_ndjson_import_reports_bad_lines_and_keeps_going(client):
+    response = import_file(client, NDJSON, 'ndjson', chunk_size=2)
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["inserted"] == 2
+    assert body["committed"] == 10
+    assert body["errors"] == [
+        {"line": 2, "error": "invalid JSON"},
+        {"line": 4, "error": "record must be an object"},
+        {"line": 5, "error": "invalid UTF-8"},
+        {"line": 6, "error": "Product name already exists"},
+        {"line": 7, "error": "rack and bin must be strings"},
+        {"line": 8, "error": "Product name already exists"},
+        {"line": 9, "error": "name & category required"},
+    ]
+    assert Product.query.filter(Product.name.in_(["drill", "screw"])).count() == 2
+
+
+def test_ndjson_import_resumes_after_skip(client):
+    response = import_file(client, NDJSON, 'ndjson', skip=9)
+
+    assert response.status_code == 200
+    assert response.get_json()["inserted"] == 1
+    assert response.get_json()["errors"] == []
+
+
+def test_csv_import_reports_bad_records_by_line(client):
+    body = (b'name,category,rack\n'
+            b'hammer,cat0,A1\n'
+            b'"multi\nline",cat1,\n'
+            b'caf\xe9,cat0,\n'
+            b'"' + b'x' * 200000 + b'",cat0,\n'
+            b',cat0,\n'
+            b'wrench,cat3,B2\n')
+    response = import_file(client, body, 'csv')
+
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result["inserted"] == 3
+    assert [error["line"] for error in result["errors"]] == [5, 6, 7]
+    assert result["errors"][0]["error"] == "invalid UTF-8"
+    assert result["errors"][1]["error"].startswith("invalid CSV")
+    assert Product.query.filter_by(name="multi\nline").count() == 1
+
+
+def test_import_with_nothing_importable_is_a_client_error(client):
+    response = import_file(client, b'not json\n{"name": 1}\n', 'ndjson')
+
+    assert response.status_code == 400
+    assert response.get_json()["inserted"] == 0
+    assert len(response.get_json()["errors"]) == 2
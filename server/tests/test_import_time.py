@@ -0,0 +1,15 @@
+import os
+from benchmarks.import_time import LAZY_MODULES, measure
+
+# Generous enough for a slow CI machine; `python -m benchmarks.import_time`
+# reports the heaviest imports when this trips.
+BUDGET_MS = float(os.environ.get('IMPORT_TIME_BUDGET_MS', 1500))
+RUNS = 3
+
+
+def test_create_app_startup_stays_lazy_and_within_budget():
+    runs = [measure() for _ in range(RUNS)]
+    total, _, modules = min(runs, key=lambda run: run[0])
+
+    assert [name for name in LAZY_MODULES if name in modules] == []
+    assert total / 1000 <= BUDGET_MS
@@ -0,0 +1,33 @@
+from app.models import Category, Location, Product
+
+
+def test_blank_rack_and_bin_are_stored_as_null(client, user):
+    category_id = Category.query.filter_by(name="cat0").one().id
+    created = client.post('/products/new', json={"name": "loose", "category_id": category_id, "rack": "R9", "bin": ""})
+    assert created.status_code == 201
+    assert created.get_json()["bin"] is None
+
+    moved = client.patch(f'/products/{created.get_json()["id"]}/edit', json={"name": "loose", "rack": "", "bin": ""})
+    assert moved.status_code == 200
+    assert (moved.get_json()["rack"], moved.get_json()["bin"]) == (None, None)
+
+    bulk = client.post('/products/bulk', json={"upserts": [{"name": "bulk-loose", "category_id": category_id, "rack": "R9", "bin": ""}]})
+    assert bulk.status_code == 200
+    assert Product.query.filter_by(name="bulk-loose").one().bin is None
+    assert Location.query.filter(Location.rack == '').count() == 0
+
+
+def test_rack_lists_products_without_a_bin(client, user):
+    category_id = Category.query.filter_by(name="cat0").one().id
+    for name in ("no-bin-a", "no-bin-b"):
+        client.post('/products/new', json={"name": name, "category_id": category_id, "rack": "R9", "bin": ""})
+    client.post('/products/new', json={"name": "binned", "category_id": category_id, "rack": "R9", "bin": "B1"})
+
+    response = client.get('/locations/R9')
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["product_count"] == 3
+    assert body["bins"] == [{"bin": None, "product_count": 2}, {"bin": "B1", "product_count": 1}]
+    assert [p["name"] for p in body["unbinned"]] == ["no-bin-a", "no-bin-b"]
+    assert client.get('/locations/R0').get_json()["unbinned"] == []
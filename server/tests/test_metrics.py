@@ -0,0 +1,30 @@
+from sqlalchemy.exc import OperationalError
+from app import create_app
+from app.extensions import db
+from app.metrics import request_metrics
+
+
+def test_failed_statement_does_not_skew_later_timings():
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite://",
+        "HASH_WORKERS": 0,
+        "METRICS_ENABLED": True,
+    })
+    with app.test_request_context('/'):
+        app.preprocess_request()
+        with db.engine.connect() as conn:
+            try:
+                conn.exec_driver_sql("SELECT * FROM no_such_table")
+            except OperationalError:
+                pass
+            assert conn.info['query_started'] == []
+            conn.exec_driver_sql("SELECT 1")
+            assert conn.info['query_started'] == []
+
+        metrics = request_metrics()
+        assert metrics.statements == 2
+        assert metrics.failed == 1
+        assert metrics.queries[0][1] == "[failed] SELECT * FROM no_such_table"
+        response = app.process_response(app.response_class())
+        assert 'desc="2 queries, 1 failed"' in response.headers['Server-Timing']
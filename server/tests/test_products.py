@@ -0,0 +1,59 @@
+import pytest
+from app.models import Category, Product
+from app.routes import encode_cursor
+
+
+def walk(client, query):
+    names, cursor = [], None
+    while True:
+        response = client.get(f'/products?{query}' + (f'&cursor={cursor}' if cursor else ''))
+        assert response.status_code == 200
+        body = response.get_json()
+        assert len(body["products"]) <= 7
+        names += [product["name"] for product in body["products"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return names
+
+
+def test_cursor_pages_cover_every_product_once(client, user):
+    by_id = walk(client, 'limit=7')
+    assert by_id == [p.name for p in Product.query.filter_by(user_id=user.id).order_by(Product.id)]
+    assert walk(client, 'limit=7&sort=name') == sorted(by_id)
+
+
+def test_filters_narrow_the_listing(client, user):
+    category_id = Category.query.filter_by(name="cat2").one().id
+    products = client.get(f'/products?category_id={category_id}&rack=R1').get_json()["products"]
+
+    assert products
+    assert all(p["category_id"] == category_id and p["rack"] == "R1" for p in products)
+    assert len(products) == Product.query.filter_by(category_id=category_id, rack="R1").count()
+
+
+@pytest.mark.parametrize('query', [
+    'cursor=not-a-cursor',
+    f'cursor={encode_cursor({"id": 3})}',
+    f'cursor={encode_cursor(["prod3"])}',
+    f'cursor={encode_cursor([True])}',
+    f'sort=name&cursor={encode_cursor([3])}',
+    f'sort=name&cursor={encode_cursor(["prod3", "4"])}',
+])
+def test_malformed_cursor_is_a_client_error(client, query):
+    response = client.get(f'/products?{query}')
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Invalid cursor"}
+
+
+def test_unknown_sort_is_a_client_error(client):
+    response = client.get('/products?sort=price')
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "sort must be id or name"}
+
+
+def test_listing_requires_login(app):
+    response = app.test_client().get('/products')
+
+    assert response.status_code == 401
@@ -0,0 +1,25 @@
+from app.models import user_schema
+from app.serializers import user_serializer
+
+# The user tree is one joined query however many products and categories the
+# user has; a lazy load per product or category would blow well past this.
+MAX_USER_DUMP_STATEMENTS = 2
+
+
+def test_user_schema_dump_statement_count(user, count_statements):
+    with count_statements() as counter:
+        data = user_schema.dump(user)
+
+    assert len(counter.statements) <= MAX_USER_DUMP_STATEMENTS, counter.statements
+    assert len(data["categories"]) == 5
+    assert sum(len(category["products"]) for category in data["categories"]) == 50
+
+
+def test_fast_user_dump_matches_schema(app, user, count_statements):
+    expected = user_schema.dump(user)
+    app.config['FAST_SERIALIZERS'] = True
+    with count_statements() as counter:
+        data = user_serializer.dump(user)
+
+    assert len(counter.statements) <= MAX_USER_DUMP_STATEMENTS, counter.statements
+    assert data == expected
@@ -0,0 +1,102 @@
+import pytest
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models import User, Category, Product
+
+# Every route is driven through the test client over a database big enough
+# for the planner to care; each statement it issues is run through EXPLAIN
+# QUERY PLAN and must not SCAN a table. Reading the whole (small, shared)
+# category catalog is allowed, and so are full-text lookups, which SQLite
+# reports as a SCAN of the FTS5 virtual table through its MATCH index.
+
+USERS = 20
+PRODUCTS = 20_000
+ALLOWED_SCANS = ('SCAN categories',)
+
+REQUESTS = [
+    ('GET', '/check_session', None),
+    ('GET', '/profile', None),
+    ('GET', '/products?limit=20', None),
+    ('GET', '/products?limit=20&sort=name', None),
+    ('GET', '/products?category_id=3', None),
+    ('GET', '/products?rack=R1&bin=B2', None),
+    ('GET', '/products/export?format=csv', None),
+    ('GET', '/products/search?q=Product', None),
+    ('GET', '/locations', None),
+    ('GET', '/locations/R1', None),
+    ('GET', '/locations/R1/B2', None),
+    ('GET', '/stats', None),
+    ('GET', '/sync?since=0', None),
+    ('POST', '/products/new', {"name": "Plan new", "category_id": 2, "rack": "R1", "bin": "B1"}),
+    ('PATCH', '/products/1/edit', {"name": "Product 0", "rack": "R2"}),
+    ('POST', '/products/bulk', {
+        "upserts": [{"name": "Plan bulk", "category_id": 3}, {"id": 41, "name": "Plan renamed"}],
+        "deletes": [61],
+    }),
+    ('DELETE', '/products/21', None),
+]
+
+
+@pytest.fixture(scope='module')
+def plans_app():
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite://",
+        "HASH_WORKERS": 0,
+        "BCRYPT_LOG_ROUNDS": 4,
+    })
+    with app.app_context():
+        db.create_all()
+        user = User(name="plans")
+        user.password_hash = "plans"
+        db.session.add(user)
+        db.session.execute(db.insert(User), [{"name": f"user {i}", "_password_hash": "x"} for i in range(USERS - 1)])
+        db.session.execute(db.insert(Category), [{"name": f"Category {i}"} for i in range(20)])
+        db.session.flush()
+        db.session.execute(db.insert(Product), [
+            {"name": f"Product {i}", "rack": f"R{i % 7}", "bin": f"B{i % 9}",
+             "category_id": i % 20 + 1, "user_id": i % USERS + 1}
+            for i in range(PRODUCTS)
+        ])
+        db.session.commit()
+        db.session.execute(db.text("ANALYZE"))
+        db.session.commit()
+    return app
+
+
+@pytest.fixture(scope='module')
+def plans_client(plans_app):
+    client = plans_app.test_client()
+    assert client.post('/login', json={"name": "plans", "password": "plans"}).status_code == 200
+    return client
+
+
+@pytest.mark.parametrize('method, path, body', REQUESTS, ids=[f'{method} {path}' for method, path, _ in REQUESTS])
+def test_route_statements_use_indexes(plans_app, plans_client, method, path, body):
+    with plans_app.app_context():
+        engine = db.engine
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().split(None, 1)[0].upper() in ('SELECT', 'WITH', 'UPDATE', 'DELETE'):
+            statements.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = plans_client.open(path, method=method, json=body)
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+    assert response.status_code < 400, response.get_data(as_text=True)
+    assert statements
+    scans = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            if isinstance(parameters, list):
+                parameters = parameters[0]
+            plan = [row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+            scans += [(step, statement) for step in plan
+                      if step.startswith('SCAN ') and not step.startswith(ALLOWED_SCANS)
+                      and 'VIRTUAL TABLE INDEX' not in step]
+    assert not scans
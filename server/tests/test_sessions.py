@@ -0,0 +1,53 @@
+import pytest
+from app import create_app
+from app.extensions import db
+from app.models import SessionRecord
+
+
+@pytest.fixture
+def app():
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite://",
+        "HASH_WORKERS": 0,
+        "BCRYPT_LOG_ROUNDS": 4,
+        "SESSION_BACKEND": "sqlite",
+    })
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+def test_cookie_is_only_written_at_login(app, user):
+    client = app.test_client()
+
+    login = client.post('/login', json={"name": "ann", "password": "1111"})
+    assert login.status_code == 200
+    assert 'Set-Cookie' in login.headers
+    assert SessionRecord.query.count() == 1
+
+    for path in ('/profile', '/check_session', '/products'):
+        response = client.get(path)
+        assert response.status_code == 200
+        assert 'Set-Cookie' not in response.headers
+    assert client.get('/check_session').get_json()["user"]["name"] == "ann"
+
+
+def test_logout_drops_the_stored_session(app, user):
+    client = app.test_client()
+    client.post('/login', json={"name": "ann", "password": "1111"})
+
+    assert client.post('/logout').status_code == 200
+    assert SessionRecord.query.count() == 0
+    assert client.get('/profile').status_code == 401
+
+
+def test_forged_session_id_is_ignored(app, user):
+    client = app.test_client()
+    client.set_cookie('session', 'forged.id')
+
+    response = client.get('/check_session')
+
+    assert response.status_code == 200
+    assert response.get_json() == {"logged_in": False}
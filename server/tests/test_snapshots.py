@@ -0,0 +1,25 @@
+from app.extensions import db
+from app.models import Product
+
+COLUMNAR = 'application/vnd.finventory.columnar+json'
+
+
+def test_columnar_snapshot_matches_nested_tree(client, user):
+    # SQLite doesn't enforce the foreign key, so orphans are easy to create
+    db.session.add(Product(name="orphan", category_id=9999, user_id=user.id))
+    db.session.commit()
+
+    nested = client.get('/profile')
+    columnar = client.get('/profile', headers={"Accept": COLUMNAR})
+
+    assert nested.status_code == 200
+    assert columnar.status_code == 200
+    assert columnar.mimetype == COLUMNAR
+    tree = nested.get_json()
+    snapshot = columnar.get_json()
+    nested_ids = [product["id"] for category in tree["categories"] for product in category["products"]]
+    assert snapshot["products"]["id"] == nested_ids
+    assert snapshot["categories"] == {
+        "id": [category["id"] for category in tree["categories"]],
+        "name": [category["name"] for category in tree["categories"]],
+    }
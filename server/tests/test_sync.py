@@ -0,0 +1,57 @@
+from app.extensions import db
+from app.models import Category, Product, SyncEntry
+
+
+def sync_all(client, since=0, limit=None):
+    """Follow /sync pages to the end; returns (pages, final version)"""
+    pages = []
+    while True:
+        query = f'/sync?since={since}' + (f'&limit={limit}' if limit else '')
+        response = client.get(query)
+        assert response.status_code == 200
+        page = response.get_json()
+        pages.append(page)
+        since = page["version"]
+        if not page["has_more"]:
+            return pages, since
+
+
+def test_backfill_makes_since_zero_return_everything(client, user):
+    # The fixture inserts rows directly, like a database from before the sync log
+    SyncEntry.backfill()
+    db.session.commit()
+
+    pages, _ = sync_all(client)
+
+    product_ids = [product["id"] for page in pages for product in page["products"]]
+    category_ids = [category["id"] for page in pages for category in page["categories"]]
+    assert sorted(product_ids) == [p.id for p in Product.query.filter_by(user_id=user.id).order_by(Product.id)]
+    assert sorted(category_ids) == [c.id for c in Category.query.order_by(Category.id)]
+
+
+def test_sync_pages_never_split_one_change(client, user):
+    SyncEntry.backfill()
+    db.session.commit()
+    category_id = Category.query.first().id
+    for i in range(3):
+        assert client.post('/products/new', json={"name": f"single{i}", "category_id": category_id}).status_code == 201
+
+    pages, version = sync_all(client, limit=2)
+
+    # The 55 backfilled entries share one seq, so they come out as one page
+    assert len(pages[0]["products"]) + len(pages[0]["categories"]) == 55
+    assert [len(page["products"]) for page in pages[1:]] == [2, 1]
+    assert pages[-1]["has_more"] is False
+    assert client.get(f'/sync?since={version}').get_json()["products"] == []
+
+
+def test_snapshot_carries_the_sync_version(client, user):
+    category_id = Category.query.first().id
+    before = client.get('/profile').get_json()["sync_version"]
+    client.post('/products/new', json={"name": "fresh", "category_id": category_id})
+
+    snapshot = client.get('/check_session').get_json()["user"]
+    page = client.get(f'/sync?since={before}').get_json()
+
+    assert snapshot["sync_version"] == page["version"] > before
+    assert [product["name"] for product in page["products"]] == ["fresh"]